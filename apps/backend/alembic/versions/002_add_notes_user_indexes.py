@@ -0,0 +1,38 @@
+"""add notes user indexes
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Per-user listing ordered by creation time
+    op.create_index('ix_notes_user_created', 'notes', ['user_id', 'created_at'], unique=False)
+    # Concurrent creates could already have stored the same video twice
+    # for a user; keep the oldest note so the unique index can be built
+    op.execute(
+        "DELETE FROM notes AS duplicate USING notes AS kept "
+        "WHERE duplicate.user_id = kept.user_id "
+        "AND duplicate.youtube_url = kept.youtube_url "
+        "AND duplicate.id > kept.id"
+    )
+    # Duplicate check; also enforces one note per user per video
+    op.create_index('ix_notes_user_url', 'notes', ['user_id', 'youtube_url'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_notes_user_url', table_name='notes')
+    op.drop_index('ix_notes_user_created', table_name='notes')
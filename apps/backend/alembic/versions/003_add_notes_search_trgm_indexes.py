@@ -0,0 +1,39 @@
+"""add notes search trigram indexes
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_COLUMNS = ('video_title', 'channel_name', 'summary')
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Match the lower(col) LIKE '%term%' expressions used by note search
+    for column in SEARCH_COLUMNS:
+        op.create_index(
+            f'ix_notes_{column}_trgm',
+            'notes',
+            [sa.text(f'lower({column}) gin_trgm_ops')],
+            unique=False,
+            postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    for column in SEARCH_COLUMNS:
+        op.drop_index(f'ix_notes_{column}_trgm', table_name='notes')
@@ -0,0 +1,50 @@
+"""convert note json fields to jsonb
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-14 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing values are JSON-encoded strings, so they cast directly.
+    # Values that aren't valid JSON become an empty list, as
+    # NoteResponse.parse_json_fields already reads them (Postgres 16+)
+    for column in ('key_points', 'timestamps'):
+        op.alter_column(
+            'notes',
+            column,
+            type_=postgresql.JSONB(),
+            existing_type=sa.Text(),
+            existing_nullable=True,
+            postgresql_using=(
+                f"CASE WHEN {column} IS NULL THEN NULL "
+                f"WHEN pg_input_is_valid({column}, 'jsonb') THEN {column}::jsonb "
+                f"ELSE '[]'::jsonb END"
+            )
+        )
+
+
+def downgrade() -> None:
+    for column in ('key_points', 'timestamps'):
+        op.alter_column(
+            'notes',
+            column,
+            type_=sa.Text(),
+            existing_type=postgresql.JSONB(),
+            existing_nullable=True,
+            postgresql_using=f'{column}::text'
+        )
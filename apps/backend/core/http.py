@@ -0,0 +1,51 @@
+"""
+Shared HTTP client
+
+Manages the application-wide aiohttp session used for outbound requests
+"""
+
+import aiohttp
+from fastapi import Request
+from core.config import settings
+
+
+def create_http_session() -> aiohttp.ClientSession:
+    """
+    Create the shared aiohttp client session
+
+    Must be called from within a running event loop (e.g. app lifespan).
+    Connections are pooled and kept alive, so repeated requests to the
+    same host skip the TCP + TLS handshake; idle connections and DNS
+    lookups are kept long enough to survive gaps between requests. The
+    default headers are sent on every request, so call sites don't
+    rebuild them.
+
+    Returns:
+        New aiohttp ClientSession
+    """
+    connector = aiohttp.TCPConnector(
+        limit=settings.HTTP_POOL_SIZE,
+        limit_per_host=settings.HTTP_POOL_SIZE_PER_HOST,
+        keepalive_timeout=settings.HTTP_KEEPALIVE_SECONDS,
+        ttl_dns_cache=settings.HTTP_DNS_CACHE_SECONDS
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={
+            "User-Agent": settings.HTTP_USER_AGENT,
+            "Referer": settings.HTTP_REFERER
+        }
+    )
+
+
+def get_http_session(request: Request) -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session for dependency injection
+
+    Args:
+        request: FastAPI request object
+
+    Returns:
+        aiohttp ClientSession stored on application state
+    """
+    return request.app.state.http
@@ -9,9 +9,10 @@ from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Request, Depends, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from core.config import settings
-from database import get_session
+from database import get_async_session
 from modules.user.model import User
 
 # Security scheme for Bearer token
@@ -202,7 +203,7 @@ def get_current_user_id(request: Request) -> int:
 
 async def get_current_user(
     request: Request,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> User:
     """
     Get current authenticated user
@@ -222,7 +223,7 @@ async def get_current_user(
 
     user_id = get_current_user_id(request)
     
-    user = session.get(User, user_id)
+    user = await session.get(User, user_id)
 
     if not user:
         raise HTTPException(
@@ -1,9 +1,44 @@
 import os
+import orjson
 from sqlmodel import create_engine, SQLModel, Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from core.config import settings
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, echo=False)
+def _json_serializer(value) -> str:
+    """Serialize JSON/JSONB column values with orjson"""
+    return orjson.dumps(value).decode()
+
+# Sized pool: pre-ping drops dead connections before use, LIFO keeps
+# the hot connections warm and lets idle ones age out via recycle.
+# Only init_db and UserService use the sync engine, so its pool is small.
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=settings.DB_SYNC_POOL_SIZE,
+    max_overflow=settings.DB_SYNC_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
+)
+
+# Async engine for request handlers on the event loop (asyncpg driver)
+async_engine = create_async_engine(
+    DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+    echo=False,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads
+)
 
 def init_db():
     """Initialize database tables"""
@@ -11,6 +46,10 @@ def init_db():
     from modules.user.model import User  # noqa: F401
     from modules.notes.model import Note  # noqa: F401
     
+    # Trigram indexes on notes need the pg_trgm extension
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    
     # Create all tables
     SQLModel.metadata.create_all(engine)
     print("✓ Database initialized successfully")
@@ -18,4 +57,10 @@ def init_db():
 def get_session():
     """Get database session for dependency injection"""
     with Session(engine) as session:
-        yield session
\ No newline at end of file
+        yield session
+
+async def get_async_session():
+    """Get async database session for dependency injection"""
+    # Objects stay usable after commit without a reload round trip
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
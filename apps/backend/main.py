@@ -1,19 +1,26 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
-from database import init_db
+from database import init_db, async_engine
 from core.config import settings
+from core.http import create_http_session
 from modules.user import user_router
-from modules.notes import notes_router
+from modules.notes import notes_router, warm_youtube_pool, shutdown_youtube_pool
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
     # Startup
     init_db()
+    app.state.http = create_http_session()
+    warm_youtube_pool()
     print(f"✓ {settings.APP_NAME} started successfully")
     yield
     # Shutdown
+    await app.state.http.close()
+    shutdown_youtube_pool()
+    await async_engine.dispose()
     print(f"✓ {settings.APP_NAME} shutdown complete")
 
 
@@ -22,6 +29,7 @@ app = FastAPI(
     description="API for converting YouTube videos into organized notes",
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json"
@@ -32,8 +40,9 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=settings.CORS_ALLOW_METHODS,
+    allow_headers=settings.CORS_ALLOW_HEADERS,
+    max_age=settings.CORS_MAX_AGE,
 )
 
 # Include routers
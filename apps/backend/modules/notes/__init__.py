@@ -9,10 +9,19 @@ from .model import (
     Note,
     NoteBase,
     NoteCreate,
+    NoteBatchCreate,
+    NoteBatchResult,
     NoteUpdate,
-    NoteResponse
+    NoteResponse,
+    NoteListItem,
+    VideoPreview
 )
-from .service import NoteService
+from .utils import (
+    extract_video_id,
+    extract_video_ids,
+    validate_youtube_url
+)
+from .service import NoteService, warm_youtube_pool, shutdown_youtube_pool
 from .route import router as notes_router
 
 __all__ = [
@@ -20,17 +29,24 @@ __all__ = [
     "Note",
     "NoteBase",
     "NoteCreate",
+    "NoteBatchCreate",
+    "NoteBatchResult",
     "NoteUpdate",
     "NoteResponse",
+    "NoteListItem",
+    "VideoPreview",
     
     # Service
     "NoteService",
+    "warm_youtube_pool",
+    "shutdown_youtube_pool",
     
     # Router
     "notes_router",
     
     # Utilities
     "extract_video_id",
+    "extract_video_ids",
     "validate_youtube_url",
     "get_video_metadata",
     "extract_audio_to_text",
@@ -7,9 +7,10 @@ Database models and Pydantic schemas for notes
 from datetime import datetime
 from typing import Optional, Any
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import Text
+from sqlalchemy import Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from pydantic import field_validator, ConfigDict
-import json
+import orjson
 
 
 class NoteBase(SQLModel):
@@ -70,7 +71,7 @@ class NoteBase(SQLModel):
             raise ValueError('YouTube URL cannot be empty')
         
         # Check if it's a valid YouTube URL
-        youtube_domains = ['youtube.com', 'youtu.be', 'www.youtube.com', 'm.youtube.com']
+        youtube_domains = ['youtube.com', 'youtu.be', 'www.youtube.com', 'm.youtube.com', 'youtube-nocookie.com']
         if not any(domain in v.lower() for domain in youtube_domains):
             raise ValueError('Invalid YouTube URL. Must be a valid YouTube link')
         
@@ -85,22 +86,33 @@ class Note(NoteBase, table=True):
     One user can have many notes (one-to-many relationship)
     """
     __tablename__ = "notes"
+    __table_args__ = (
+        # Serves the per-user list query ordered by newest first
+        Index("ix_notes_user_created", "user_id", "created_at"),
+        # Serves the duplicate check and enforces one note per user per video
+        Index("ix_notes_user_url", "user_id", "youtube_url", unique=True),
+        # Trigram indexes let the case-insensitive substring search
+        # (lower(col) LIKE '%term%') use an index instead of a full scan
+        Index("ix_notes_video_title_trgm", text("lower(video_title) gin_trgm_ops"), postgresql_using="gin"),
+        Index("ix_notes_channel_name_trgm", text("lower(channel_name) gin_trgm_ops"), postgresql_using="gin"),
+        Index("ix_notes_summary_trgm", text("lower(summary) gin_trgm_ops"), postgresql_using="gin"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: int = Field(
         foreign_key="users.id",
         description="ID of the user who owns this note"
     )
-    # Override fields to store as JSON strings in database
-    key_points: Optional[str] = Field(
+    # Override fields to store as native JSONB in database
+    key_points: Optional[list[str]] = Field(
         default=None,
-        sa_column=Column(Text),
-        description="Key points from the video (stored as JSON)"
+        sa_column=Column(JSONB),
+        description="Key points from the video (stored as JSONB)"
     )
-    timestamps: Optional[str] = Field(
+    timestamps: Optional[list[dict]] = Field(
         default=None,
-        sa_column=Column(Text),
-        description="Important timestamps from the video (stored as JSON)"
+        sa_column=Column(JSONB),
+        description="Important timestamps from the video (stored as JSONB)"
     )
     duration_in_seconds: Optional[int] = Field(
         default=None,
@@ -174,7 +186,7 @@ class NoteCreate(SQLModel):
             raise ValueError('YouTube URL cannot be empty')
         
         # Check if it's a valid YouTube URL
-        youtube_domains = ['youtube.com', 'youtu.be', 'www.youtube.com', 'm.youtube.com']
+        youtube_domains = ['youtube.com', 'youtu.be', 'www.youtube.com', 'm.youtube.com', 'youtube-nocookie.com']
         if not any(domain in v.lower() for domain in youtube_domains):
             raise ValueError('Invalid YouTube URL. Must be a valid YouTube link')
         
@@ -189,6 +201,39 @@ class NoteCreate(SQLModel):
     )
 
 
+class NoteBatchCreate(SQLModel):
+    """
+    Schema for creating notes from several videos at once
+    
+    Used by the batch import endpoint; URLs are validated together
+    """
+    youtube_urls: list[str] = Field(
+        min_length=1,
+        max_length=20,
+        description="YouTube video URLs"
+    )
+
+    @field_validator('youtube_urls')
+    @classmethod
+    def strip_youtube_urls(cls, v: list[str]) -> list[str]:
+        """Strip whitespace and reject empty URLs"""
+        urls = [url.strip() for url in v]
+        if not all(urls):
+            raise ValueError('YouTube URL cannot be empty')
+        return urls
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "youtube_urls": [
+                    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                    "https://youtu.be/jNQXAC9IVRw"
+                ]
+            }
+        }
+    )
+
+
 class NoteUpdate(SQLModel):
     """
     Schema for updating note information
@@ -237,22 +282,23 @@ class NoteResponse(NoteBase):
     @classmethod
     def parse_json_fields(cls, v: Any) -> Any:
         """
-        Parse JSON string to Python list/dict when loading from database
+        Parse JSON string to Python list/dict for rows stored as text
         
-        If JSON parsing fails, returns empty list to maintain type contract
+        JSONB columns already load as lists; strings only come from rows
+        written before the JSONB migration. If JSON parsing fails, returns empty list to maintain type contract
         (key_points expects list[str], timestamps expects list[dict])
         """
         if v is None:
             return None
         if isinstance(v, str):
             try:
-                parsed = json.loads(v)
+                parsed = orjson.loads(v)
                 # Ensure parsed value is the correct type
                 if isinstance(parsed, list):
                     return parsed
                 # If parsed value is not a list, return empty list to maintain type contract
                 return []
-            except (json.JSONDecodeError, TypeError):
+            except (orjson.JSONDecodeError, TypeError):
                 # JSON parsing failed - return empty list to maintain type contract
                 # This prevents type validation errors when field expects list but receives string
                 return []
@@ -285,3 +331,102 @@ class NoteResponse(NoteBase):
         }
     )
 
+
+class NoteBatchResult(SQLModel):
+    """
+    Schema for the outcome of one URL in a batch import
+    
+    Exactly one of note and error is set
+    """
+    youtube_url: str
+    note: Optional[NoteResponse] = None
+    error: Optional[str] = None
+
+
+class NoteListItem(SQLModel):
+    """
+    Schema for a note in list responses
+    
+    Carries only what the notes list renders; the full key points and
+    timestamps are fetched with the single note
+    """
+    id: int
+    youtube_url: str
+    video_title: Optional[str] = None
+    channel_name: Optional[str] = None
+    summary: Optional[str] = None
+    key_points_count: int = 0
+    duration_in_seconds: Optional[int] = None
+    thumbnail_url: Optional[str] = None
+    views: Optional[int] = None
+    likes: Optional[int] = None
+    created_at: datetime
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "id": 1,
+                "youtube_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                "video_title": "Example Video Title",
+                "channel_name": "Example Channel",
+                "summary": "This is a summary of the video content...",
+                "key_points_count": 3,
+                "duration_in_seconds": 3600,
+                "thumbnail_url": "https://i.ytimg.com/vi/dQw4w9WgXcQ/maxresdefault.jpg",
+                "views": 1000000,
+                "likes": 50000,
+                "created_at": "2024-01-01T00:00:00"
+            }
+        }
+    )
+
+
+class VideoPreview(SQLModel):
+    """
+    Schema for video details shown before a note is created
+    
+    Built from video metadata alone; no captions are downloaded
+    """
+    youtube_url: str
+    title: Optional[str] = None
+    channel_name: Optional[str] = None
+    thumbnail_url: Optional[str] = None
+    duration_in_seconds: Optional[int] = None
+    views: Optional[int] = None
+    likes: Optional[int] = None
+    publish_date: Optional[datetime] = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "youtube_url": "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+                "title": "Example Video Title",
+                "channel_name": "Example Channel",
+                "thumbnail_url": "https://i.ytimg.com/vi/dQw4w9WgXcQ/maxresdefault.jpg",
+                "duration_in_seconds": 3600,
+                "views": 1000000,
+                "likes": 50000,
+                "publish_date": "2024-01-01T00:00:00"
+            }
+        }
+    )
+
+
+class NoteTimestamp(SQLModel):
+    """Single important moment in a video"""
+    time: str = Field(description="MM:SS, or HH:MM:SS for videos of 1 hour or longer")
+    description: str = Field(description="What happens at this timestamp")
+
+
+class GeneratedNoteContent(SQLModel):
+    """
+    Schema for note content generated by Gemini
+    
+    Passed to Gemini as the response schema so the model returns
+    well-formed JSON in exactly this shape
+    """
+    video_title: str = Field(description="Exact video title as provided")
+    channel_name: str = Field(description="Exact channel name as provided")
+    summary: str = Field(description="Summary of the video in 2-3 paragraphs")
+    key_points: list[str] = Field(description="5-10 key points, most important first")
+    timestamps: list[NoteTimestamp] = Field(description="3-7 important timestamps, sorted ascending")
@@ -5,19 +5,25 @@ API endpoints for notes management
 """
 
 from fastapi import APIRouter, Depends, status
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional, List
 
-from database import get_session
+from database import get_async_session
+from core.http import get_http_session
 from modules.notes.model import (
     NoteCreate,
+    NoteBatchCreate,
+    NoteBatchResult,
     NoteUpdate,
-    NoteResponse
+    NoteResponse,
+    NoteListItem,
+    VideoPreview
 )
 from modules.notes.service import NoteService
 from modules.user.model import User
 from core.security import get_current_active_user
 from pydantic import BaseModel
+import aiohttp
 
 
 router = APIRouter(prefix="/api/notes", tags=["notes"])
@@ -29,7 +35,7 @@ router = APIRouter(prefix="/api/notes", tags=["notes"])
 
 class NotePagination(BaseModel):
     """Note pagination response"""
-    notes: List[NoteResponse]
+    notes: List[NoteListItem]
     total_notes: int
     total_pages: int
     current_page: int
@@ -46,10 +52,11 @@ class MessageResponse(BaseModel):
 # ============================================================================
 
 def get_note_service(
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session),
+    http_session: aiohttp.ClientSession = Depends(get_http_session)
 ) -> NoteService:
     """Dependency injection for NoteService"""
-    return NoteService(session=session)
+    return NoteService(session=session, http_session=http_session)
 
 
 # ============================================================================
@@ -63,8 +70,9 @@ def get_note_service(
     summary="Create a new note from YouTube video",
     description="Create a note by providing a YouTube video URL. The system will fetch the transcript and generate notes using AI."
 )
-def create_note(
+async def create_note(
     note_data: NoteCreate,
+    cache_bust: bool = False,
     current_user: User = Depends(get_current_active_user),
     note_service: NoteService = Depends(get_note_service)
 ):
@@ -74,6 +82,7 @@ def create_note(
     Requires authentication
     
     - **youtube_url**: Valid YouTube video URL
+    - **cache_bust**: Re-fetch video metadata instead of using the cache (default: false)
     
     The system will:
     1. Validate the YouTube URL
@@ -84,13 +93,44 @@ def create_note(
     
     Returns the created note with all generated content.
     """
-    note = note_service.create_note(
+    note = await note_service.create_note(
         user_id=current_user.id,
-        note_data=note_data
+        note_data=note_data,
+        refresh_metadata=cache_bust
     )
     return note
 
 
+@router.post(
+    "/batch",
+    response_model=List[NoteBatchResult],
+    summary="Create notes from several YouTube videos",
+    description="Create one note per YouTube video URL. All URLs are validated before any note is generated; each video then reports its note or its error."
+)
+async def create_notes(
+    note_data: NoteBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+    note_service: NoteService = Depends(get_note_service)
+):
+    """
+    Create notes from a list of YouTube video URLs
+    
+    Requires authentication
+    
+    - **youtube_urls**: 1-20 valid YouTube video URLs
+    
+    Invalid URLs reject the whole batch; repeated videos are only
+    processed once. Existing notes are returned as-is. A video that
+    fails doesn't affect the others: its result carries the error
+    instead of a note, and the notes already created are kept.
+    """
+    results = await note_service.create_notes(
+        user_id=current_user.id,
+        note_data=note_data
+    )
+    return results
+
+
 # ============================================================================
 # NOTES CRUD ENDPOINTS - Read
 # ============================================================================
@@ -101,7 +141,7 @@ def create_note(
     summary="Get all notes",
     description="Get paginated list of notes for the current user with optional search"
 )
-def get_notes(
+async def get_notes(
     current_page: int = 1,
     page_size: int = 10,
     search: Optional[str] = None,
@@ -118,7 +158,7 @@ def get_notes(
     - **page_size**: Items per page (default: 10, max: 100)
     - **search**: Search term for title, channel, or summary
     """
-    result = note_service.get_notes(
+    result = await note_service.get_notes(
         user_id=current_user.id,
         current_page=current_page,
         page_size=page_size,
@@ -128,13 +168,37 @@ def get_notes(
     return NotePagination(**result)
 
 
+@router.get(
+    "/preview",
+    response_model=VideoPreview,
+    summary="Preview a YouTube video",
+    description="Get video details for a YouTube URL without downloading captions or generating a note"
+)
+async def get_video_preview(
+    youtube_url: str,
+    current_user: User = Depends(get_current_active_user),
+    note_service: NoteService = Depends(get_note_service)
+):
+    """
+    Preview a YouTube video before creating a note
+    
+    Requires authentication
+    Usually served from oEmbed, in which case duration, views, likes
+    and publish date are null
+    
+    - **youtube_url**: Valid YouTube video URL
+    """
+    preview = await note_service.get_video_preview(youtube_url.strip())
+    return preview
+
+
 @router.get(
     "/{note_id}",
     response_model=NoteResponse,
     summary="Get note by ID",
     description="Get specific note information by ID"
 )
-def get_note_by_id(
+async def get_note_by_id(
     note_id: int,
     current_user: User = Depends(get_current_active_user),
     note_service: NoteService = Depends(get_note_service)
@@ -147,7 +211,7 @@ def get_note_by_id(
     
     - **note_id**: Note ID to retrieve
     """
-    note = note_service.get_note_by_id(note_id, current_user.id)
+    note = await note_service.get_note_by_id(note_id, current_user.id)
     return note
 
 
@@ -161,7 +225,7 @@ def get_note_by_id(
     summary="Update note",
     description="Update note information"
 )
-def update_note(
+async def update_note(
     note_id: int,
     note_data: NoteUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -181,7 +245,7 @@ def update_note(
       - key_points
       - timestamps
     """
-    note = note_service.update_note(
+    note = await note_service.update_note(
         note_id=note_id,
         user_id=current_user.id,
         note_data=note_data
@@ -199,7 +263,7 @@ def update_note(
     summary="Delete note",
     description="Delete a note permanently"
 )
-def delete_note(
+async def delete_note(
     note_id: int,
     current_user: User = Depends(get_current_active_user),
     note_service: NoteService = Depends(get_note_service)
@@ -213,5 +277,5 @@ def delete_note(
     
     - **note_id**: Note ID to delete
     """
-    result = note_service.delete_note(note_id, current_user.id)
+    result = await note_service.delete_note(note_id, current_user.id)
     return MessageResponse(**result)
\ No newline at end of file
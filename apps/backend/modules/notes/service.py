@@ -7,49 +7,817 @@ YouTube video processing, and Gemini AI integration
 
 import re
 import os
+import io
+import asyncio
+import hashlib
+import time
+from string import Template
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import xml.etree.ElementTree as ET
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, TYPE_CHECKING
+from functools import lru_cache
 from datetime import datetime
-from sqlmodel import Session, select, func, or_
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from sqlmodel import select, func, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy import update, delete
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 import logging
-import json
+import orjson
+import ijson
 from google import genai
-from pytubefix import YouTube
-from pytubefix.cli import on_progress
-import requests
-from pydub import AudioSegment
-from deepgram import DeepgramClient
+from google.genai import errors as genai_errors
+from google.genai import types as genai_types
+import aiohttp
+from cachetools import TTLCache
+from diskcache import Cache
 
+# pytubefix is only needed inside the YouTube workers and Deepgram only
+# on the audio fallback, so both are imported where they are used
+if TYPE_CHECKING:
+    from pytubefix import YouTube
+    from deepgram import DeepgramClient
 
-from modules.notes.model import Note, NoteCreate, NoteUpdate, NoteResponse
+from modules.notes.model import (
+    Note,
+    NoteCreate,
+    NoteBatchCreate,
+    NoteUpdate,
+    NoteResponse,
+    GeneratedNoteContent
+)
+from modules.notes.utils import extract_video_id, extract_video_ids
 from core.config import settings
 
 
 logger = logging.getLogger(__name__)
 
 
+def _create_gemini_client() -> Optional[genai.Client]:
+    """
+    Create the shared Gemini client
+    
+    Returns:
+        Gemini client, or None if GEMINI_API_KEY is not set
+    """
+    if not settings.GEMINI_API_KEY:
+        logger.error("GEMINI_API_KEY is not set, note generation is disabled")
+        return None
+    return genai.Client(api_key=settings.GEMINI_API_KEY)
+
+
+# Shared Gemini client, built once so connections and auth are reused
+_GEMINI_CLIENT = _create_gemini_client()
+
+@lru_cache(maxsize=None)
+def _get_deepgram_client() -> "DeepgramClient":
+    """
+    Get the shared Deepgram client, creating it on first use
+    
+    Only the audio transcription fallback needs Deepgram, so its SDK is
+    not imported until a video without captions comes along.
+    
+    Returns:
+        Deepgram client
+    """
+    from deepgram import DeepgramClient
+    
+    return DeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
+
+
+class _VideoUnavailableError(Exception):
+    """
+    YouTube reported the video as private, deleted or otherwise unavailable
+    
+    Raised by the YouTube workers in place of pytubefix's definitive
+    VideoUnavailable errors, so the main process can catch it without
+    importing pytubefix. Bot checks and login walls are not mapped to it.
+    """
+
+
+# Bounds in-flight Gemini calls so bursts queue here instead of hitting 429s
+_GEMINI_SEMAPHORE = asyncio.Semaphore(settings.GEMINI_MAX_CONCURRENCY)
+
+# Gemini status codes worth retrying (rate limited / overloaded)
+_GEMINI_RETRYABLE_CODES = (429, 503)
+
+# Bounds videos fetched from YouTube at once so bursts stay under its rate limits
+_YOUTUBE_SEMAPHORE = asyncio.Semaphore(settings.YOUTUBE_MAX_CONCURRENCY)
+
+# HTTP status codes worth retrying on YouTube requests (rate limited / transient)
+_HTTP_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Direct caption endpoint, answers without a player-response round trip
+_TIMEDTEXT_URL = "https://www.youtube.com/api/timedtext"
+_TIMEDTEXT_TIMEOUT = aiohttp.ClientTimeout(total=5)
+
+# Caption track downloads can be several MB, so they get longer
+_CAPTION_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Caption language codes to prefer, in order, when timedtext is empty.
+# Manual tracks come first; pytubefix prefixes auto-generated ones with "a."
+_PREFERRED_CAPTION_CODES = ("en", "en-US", "en-GB", "a.en", "a.en-US", "a.en-GB")
+_CAPTION_CODE_RANK = {code: rank for rank, code in enumerate(_PREFERRED_CAPTION_CODES)}
+
+# oEmbed endpoint and the video details it can fill in
+_OEMBED_URL = "https://www.youtube.com/oembed"
+_OEMBED_FIELDS = ("title", "channel_name", "thumbnail_url")
+# Tight per-attempt timeouts plus an overall budget across retries, so an
+# unreachable oEmbed never holds up a note for long
+_OEMBED_TIMEOUT = aiohttp.ClientTimeout(sock_connect=2, sock_read=4)
+_OEMBED_BUDGET_SECONDS = 5
+
+# max-age directive of a Cache-Control header
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+# Fetched video metadata + subtitles by video ID. Only touched from the
+# event loop thread, so no lock is needed.
+_VIDEO_METADATA_CACHE: TTLCache = TTLCache(
+    maxsize=settings.VIDEO_METADATA_CACHE_SIZE,
+    ttl=settings.VIDEO_METADATA_CACHE_TTL_SECONDS
+)
+
+# oEmbed details by video ID, kept separately since they outlive a cache
+# miss on the full metadata (e.g. a refresh). Entries are (expires_at,
+# details) so a short Cache-Control max-age ends them before the cache's
+# own TTL. Event loop thread only.
+_OEMBED_CACHE: TTLCache = TTLCache(
+    maxsize=settings.OEMBED_CACHE_SIZE,
+    ttl=settings.OEMBED_CACHE_TTL_SECONDS
+)
+
+# Video IDs YouTube reported as unavailable (private, deleted, blocked),
+# so repeat requests fail fast. Event loop thread only.
+_UNAVAILABLE_VIDEO_CACHE: TTLCache = TTLCache(
+    maxsize=settings.UNAVAILABLE_VIDEO_CACHE_SIZE,
+    ttl=settings.UNAVAILABLE_VIDEO_CACHE_TTL_SECONDS
+)
+
+# pytubefix extraction is GIL-bound pure Python, so it runs in worker
+# processes. Workers are spawned at startup by warm_youtube_pool().
+_YOUTUBE_POOL_SIZE = settings.YOUTUBE_PROCESS_POOL_SIZE or os.cpu_count()
+_YOUTUBE_POOL = ProcessPoolExecutor(max_workers=_YOUTUBE_POOL_SIZE)
+
+# Appended to the note prompt when several videos share one Gemini call
+_NOTE_BATCH_PROMPT_INSTRUCTIONS = """B — Batch
+The INPUT blocks below belong to several different videos, numbered VIDEO 1, VIDEO 2, and so on. Apply every instruction above to each video independently and return a JSON array with exactly one note object per video, in the same order as the videos.
+"""
+
+# Map step for long transcripts: each chunk is condensed before the note prompt
+_DIGEST_PROMPT_INSTRUCTIONS = """You will receive one consecutive part of a longer video transcript. Condense it into a bullet list of its main ideas, facts, examples and conclusions, keeping the order in which they appear. Write in the language of the transcript. Return only the bullet list.
+
+TRANSCRIPT PART:
+"""
+
+# Bump whenever the prompt below changes so cached notes are regenerated
+_NOTE_PROMPT_VERSION = 1
+
+# CRISP-E formatted note prompt (Context → Role → Instructions → Style → Examples).
+# Output shape is enforced by the response schema, so the prompt only
+# describes content. The per-video INPUT block is appended after it.
+_NOTE_PROMPT_INSTRUCTIONS = """C — Context
+You will receive raw subtitle text and video metadata (title, channel, URL) in the INPUT block at the end. Analyze the subtitle text deeply and extract structured, accurate, human-readable notes that allow a reader to understand what the video is about, its main ideas, and where important content appears. Use the subtitle text as the primary source. If you cannot detect the language confidently, default to the language of the subtitle text provided.
+
+R — Role
+Act as an expert note-taking assistant and world-class explainer who distills long videos into clear notes and identifies key teaching points.
+
+I — Instructions
+1. Use the EXACT video_title and channel_name provided in INPUT — do NOT change them.
+2. Detect the language of subtitle_text and write every text field (summary, key_points, descriptions) in that detected language.
+3. Timestamps requirements:
+   - Provide between 3 and 7 timestamp entries (only truly important moments).
+   - Format: use MM:SS for videos under 1 hour; use HH:MM:SS for videos 1 hour or longer (if video length unknown, default to MM:SS).
+   - Timestamps must be sorted ascending.
+   - If an exact timestamp cannot be determined from subtitle_text, provide the nearest approximate timestamp and append " (approx)" to the time value.
+4. Key points requirements:
+   - Provide 5–10 items.
+   - Each key point should be a single sentence or phrase (5–25 words).
+   - Order by importance (most important first).
+5. Summary requirements:
+   - "summary" must be 2–3 paragraphs, each paragraph 2–4 sentences.
+6. If subtitle_text is empty or contains insufficient content, return empty arrays and a brief explanatory summary in the same language.
+
+S — Style
+- All textual output must be in the detected language of the subtitle_text.
+- Write summaries in a clear, professional, and informative tone.
+- Key points should be concise and actionable.
+- Timestamp descriptions should be brief (10-30 words) and descriptive.
+
+E — Example
+Input:
+video_title: "How Neural Networks Learn"
+channel_name: "AI Explained"
+subtitle_text: "Today we learn how neural networks adjust weights... Backpropagation helps minimize loss..."
+
+Output:
+{
+"video_title": "How Neural Networks Learn",
+"channel_name": "AI Explained",
+"summary": "The video explains how neural networks adjust weights using backpropagation. It covers the fundamental concepts of gradient descent and error minimization. The explanation provides clear insights into the learning mechanism of artificial intelligence systems.",
+"key_points": [
+    "Neural networks improve by adjusting weights to reduce error.",
+    "Backpropagation calculates gradients to guide learning.",
+    "Gradient descent minimizes loss functions effectively."
+],
+"timestamps": [
+    {"time": "00:10", "description": "Introduction to neural networks and learning process."},
+    {"time": "00:45", "description": "Explanation of backpropagation mechanism."}
+]
+}
+"""
+
+# Per-video INPUT block that follows the instructions
+_NOTE_INPUT_TEMPLATE = Template(
+    "INPUT:\n"
+    "- video_title: ${video_title}\n"
+    "- channel_name: ${channel_name}\n"
+    "- video_url: ${video_url}\n"
+    "- subtitle_text: ${subtitle_text}\n"
+)
+
+# Instructions as a prebuilt Part, shared by every note prompt
+_NOTE_PROMPT_PART = genai_types.Part.from_text(text=_NOTE_PROMPT_INSTRUCTIONS)
+
+# Audio transcripts by video ID. Transcription is the slowest path, so
+# results live on disk where every worker process and restart sees them.
+_TRANSCRIPT_CACHE = Cache(os.path.join(settings.DISK_CACHE_DIR, 'transcripts'))
+
+# Video metadata + subtitles and oEmbed details by video ID, behind the
+# in-process caches so a hit in any worker or after a restart skips YouTube
+_VIDEO_METADATA_DISK_CACHE = Cache(os.path.join(settings.DISK_CACHE_DIR, 'video_metadata'))
+_OEMBED_DISK_CACHE = Cache(os.path.join(settings.DISK_CACHE_DIR, 'oembed'))
+
+# Generated note content by prompt hash, so the same video is only sent
+# to Gemini once
+_NOTE_CONTENT_CACHE = Cache(os.path.join(settings.DISK_CACHE_DIR, 'note_content'))
+
+# Columns selected for note list items (see NoteListItem)
+_NOTE_LIST_COLUMNS = (
+    Note.id,
+    Note.youtube_url,
+    Note.video_title,
+    Note.channel_name,
+    Note.summary,
+    func.coalesce(func.jsonb_array_length(Note.key_points), 0).label("key_points_count"),
+    Note.duration_in_seconds,
+    Note.thumbnail_url,
+    Note.views,
+    Note.likes,
+    Note.created_at,
+)
+
+# Runs of whitespace inside a single caption segment
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Fallback for XML transcripts ElementTree cannot parse
+_XML_TEXT_RE = re.compile(r'<text[^>]*>([^<]+)</text>')
+
+# Maps ASCII whitespace other than the space itself to a space
+_ASCII_WHITESPACE_TABLE = str.maketrans('\t\n\r\v\f', '     ')
+
+
+def _collapse_whitespace(text: str) -> str:
+    """
+    Strip a caption segment and collapse internal whitespace runs
+    
+    ASCII segments, the common case, are rewritten with str.translate
+    and str.replace, which beat the regex on bulk text. Only segments
+    that may contain Unicode whitespace go through the regex.
+    
+    Args:
+        text: Raw caption segment text
+        
+    Returns:
+        Segment text with single spaces and no surrounding whitespace
+    """
+    text = text.strip()
+    if not text.isascii():
+        return _WHITESPACE_RE.sub(' ', text)
+    
+    text = text.translate(_ASCII_WHITESPACE_TABLE)
+    while '  ' in text:
+        text = text.replace('  ', ' ')
+    return text
+
+
+def _cache_control_ttl(cache_control: Optional[str], max_ttl: int) -> int:
+    """
+    Work out how long a response may be cached from its Cache-Control
+    
+    Args:
+        cache_control: Cache-Control header value, if any
+        max_ttl: Upper bound, also used when the header sets no max-age
+        
+    Returns:
+        Seconds the response may be cached, 0 if it must not be
+    """
+    if not cache_control:
+        return max_ttl
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return 0
+    match = _MAX_AGE_RE.search(cache_control)
+    return min(int(match.group(1)), max_ttl) if match else max_ttl
+
+
+def _join_caption_segments(segments: Iterable[Optional[str]]) -> str:
+    """
+    Normalize caption segments and join them with single spaces
+    
+    Segments are written into one buffer as they arrive, so neither a
+    list of parts nor a second whitespace pass over the result is needed.
+    
+    Args:
+        segments: Raw caption segment texts; blank or None ones are skipped
+        
+    Returns:
+        Joined caption text
+    """
+    buffer = io.StringIO()
+    for text in segments:
+        if text and not text.isspace():
+            if buffer.tell():
+                buffer.write(" ")
+            buffer.write(_collapse_whitespace(text))
+    return buffer.getvalue()
+
+
+def _downsample_subtitle_text(subtitle_text: str, max_chars: int) -> str:
+    """
+    Deterministically shrink subtitle text to a character budget
+    
+    Keeps the opening, the middle and the ending of the transcript,
+    each a third of the budget, so the model still sees how the video
+    starts, develops and concludes.
+    
+    Args:
+        subtitle_text: Full subtitle text
+        max_chars: Maximum number of subtitle characters to keep
+        
+    Returns:
+        Original text if within budget, otherwise the sampled text
+    """
+    if len(subtitle_text) <= max_chars:
+        return subtitle_text
+    
+    third = max_chars // 3
+    middle = len(subtitle_text) // 2
+    head = subtitle_text[:third]
+    mid = subtitle_text[middle - third // 2:middle + third // 2]
+    tail = subtitle_text[-third:]
+    return f"{head}\n...[truncated]...\n{mid}\n...[truncated]...\n{tail}"
+
+
+def _json3_caption_url(caption_url: str) -> str:
+    """
+    Rewrite a caption track URL to request the JSON3 format
+    
+    Args:
+        caption_url: Caption track URL
+        
+    Returns:
+        Same URL with fmt=json3
+    """
+    parts = urlsplit(caption_url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query['fmt'] = 'json3'
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _read_video_details(yt: "YouTube") -> Dict[str, Any]:
+    """
+    Read video details from a pytubefix YouTube object
+    
+    Args:
+        yt: pytubefix YouTube object
+        
+    Returns:
+        Dictionary with video metadata
+    """
+    return {
+        "title": yt.title,
+        "channel_name": yt.author,
+        "duration_in_seconds": yt.length,
+        "thumbnail_url": yt.thumbnail_url,
+        "views": yt.views,
+        "likes": yt.likes,
+        "publish_date": yt.publish_date,
+    }
+
+
+def _download_audio(yt: "YouTube", video_url: str) -> bytes:
+    """
+    Download a video's audio track into memory
+    
+    The m4a data is streamed into a buffer and handed to Deepgram as-is,
+    which accepts AAC directly, so no temp file, ffmpeg decode or WAV
+    file is needed. Audio streams are tried from the lowest bitrate up:
+    speech transcribes just as well at ~48 kbps as at 128 kbps, for a
+    fraction of the bytes downloaded and sent to Deepgram. All streams
+    come from the already loaded player response, so a failed download
+    moves on to the next one without extracting the video again.
+    
+    Args:
+        yt: pytubefix YouTube object with its player response loaded
+        video_url: YouTube video URL, used in error messages
+        
+    Returns:
+        Raw audio file bytes
+    """
+    audio_streams = yt.streams.filter(only_audio=True, subtype="mp4").order_by("abr").asc()
+    download_error = None
+    for stream in audio_streams:
+        buffer = io.BytesIO()
+        try:
+            stream.stream_to_buffer(buffer)
+            return buffer.getvalue()
+        except OSError as e:
+            download_error = e
+            logger.warning(f"Audio stream {stream.itag} download failed, trying next: {str(e)}")
+    
+    raise RuntimeError(f"No downloadable audio stream for {video_url}") from download_error
+
+
+def _extract_video_info(video_url: str, download_audio: bool = True) -> Dict[str, Any]:
+    """
+    Load a video's player response with pytubefix and return plain data
+    
+    Runs in the YouTube process pool, so it must stay a picklable top-level
+    function and return only picklable values. Failing to read the video
+    details is not fatal; the caller can fill them in from oEmbed. When
+    the video has no caption tracks, its audio is downloaded with the
+    same YouTube object so the player response is only fetched once.
+    
+    Args:
+        video_url: YouTube video URL
+        download_audio: Download the audio when there are no caption tracks
+        
+    Returns:
+        Dictionary with "details" (video metadata, possibly empty),
+        "caption_tracks" (list of {"code", "name", "url"} dicts) and
+        "audio_bytes" (audio file bytes, or None if captions exist)
+        
+    Raises:
+        _VideoUnavailableError: If YouTube reports the video as private,
+            deleted, removed, region-blocked or members-only
+        RuntimeError: For any other failure, bot checks included. pytubefix and urllib errors
+            can't always be unpickled in the parent, which would break the
+            whole pool, so they are re-raised as plain messages.
+    """
+    from pytubefix import YouTube
+    from pytubefix.cli import on_progress
+    from pytubefix.exceptions import (
+        VideoUnavailable,
+        VideoPrivate,
+        MembersOnly,
+        VideoRegionBlocked,
+        VideoRemovedByUploader,
+        VideoRemovedByYouTubeForViolatingTOS,
+        VideoBlockedByCopyright,
+        AccountTerminated,
+    )
+    
+    # Final verdicts on the video, safe to remember; the base class itself
+    # is raised for deleted videos
+    definitive_errors = (
+        VideoPrivate,
+        MembersOnly,
+        VideoRegionBlocked,
+        VideoRemovedByUploader,
+        VideoRemovedByYouTubeForViolatingTOS,
+        VideoBlockedByCopyright,
+        AccountTerminated,
+    )
+    
+    try:
+        yt = YouTube(video_url, on_progress_callback=on_progress)
+        caption_tracks = [
+            {"code": caption.code, "name": caption.name, "url": caption.url}
+            for caption in yt.captions
+        ]
+        
+        try:
+            details = _read_video_details(yt)
+        except Exception as e:
+            logger.warning(f"Failed to read video details, falling back to oEmbed: {str(e)}")
+            details = {}
+        
+        audio_bytes = None
+        if download_audio and not caption_tracks:
+            audio_bytes = _download_audio(yt, video_url)
+        
+    except VideoUnavailable as e:
+        # Other subclasses (bot checks, login walls, live streams) say
+        # nothing final about the video and fail like any other error
+        if type(e) is VideoUnavailable or isinstance(e, definitive_errors):
+            raise _VideoUnavailableError(str(e)) from None
+        raise RuntimeError(f"{type(e).__name__}: {str(e)}") from None
+    except Exception as e:
+        raise RuntimeError(f"{type(e).__name__}: {str(e)}") from None
+    
+    return {
+        "details": details,
+        "caption_tracks": caption_tracks,
+        "audio_bytes": audio_bytes,
+    }
+
+
+def _warm_youtube_worker() -> None:
+    """Import pytubefix in a YouTube worker ahead of its first task"""
+    import pytubefix  # noqa: F401
+
+
+def warm_youtube_pool() -> None:
+    """
+    Spawn every YouTube extraction worker up front
+    
+    The pool only forks a worker when a task finds none idle, so the
+    first requests after startup would pay for process creation. One
+    warm-up task per worker brings them all up, with pytubefix imported,
+    without blocking startup.
+    """
+    for _ in range(_YOUTUBE_POOL_SIZE):
+        _YOUTUBE_POOL.submit(_warm_youtube_worker)
+
+
+def _rebuild_youtube_pool(broken_pool: ProcessPoolExecutor) -> None:
+    """
+    Replace the YouTube process pool after it broke
+    
+    A worker that died (e.g. killed for memory) leaves the pool failing
+    every later submit. Several tasks can see the same broken pool, so
+    it is only replaced if no one has done so yet.
+    
+    Args:
+        broken_pool: Pool the failing task was submitted to
+    """
+    global _YOUTUBE_POOL
+    if _YOUTUBE_POOL is not broken_pool:
+        return
+    logger.warning("YouTube process pool is broken, starting a new one")
+    broken_pool.shutdown(wait=False, cancel_futures=True)
+    _YOUTUBE_POOL = ProcessPoolExecutor(max_workers=_YOUTUBE_POOL_SIZE)
+    warm_youtube_pool()
+
+
+def shutdown_youtube_pool() -> None:
+    """Shut down the YouTube extraction process pool"""
+    _YOUTUBE_POOL.shutdown(wait=False, cancel_futures=True)
+
+
+def _note_prompt_contents(*video_parts: str) -> genai_types.Content:
+    """
+    Build note prompt contents from the static instructions and video input
+    
+    The instructions are always the first part and byte-identical across
+    calls, so Gemini's implicit prefix caching can reuse them.
+    
+    Args:
+        *video_parts: Per-call text parts following the instructions
+        
+    Returns:
+        User Content for generate_content
+    """
+    return genai_types.Content(
+        role="user",
+        parts=[_NOTE_PROMPT_PART, *(genai_types.Part.from_text(text=part) for part in video_parts)]
+    )
+
+
+def _parsed_response(response: Any) -> Any:
+    """
+    Get the schema-validated payload of a JSON-mode Gemini response
+    
+    Args:
+        response: Gemini GenerateContentResponse requested with a response schema
+        
+    Returns:
+        Plain dict, or list of dicts for a list schema
+        
+    Raises:
+        ValueError: If the response could not be parsed into the schema
+    """
+    parsed = response.parsed
+    if parsed is None:
+        raise ValueError("Gemini response did not match the response schema")
+    if isinstance(parsed, list):
+        return [item.model_dump() for item in parsed]
+    return parsed.model_dump()
+
+
+async def _call_gemini(contents: Any, response_schema: Optional[Any] = None) -> Any:
+    """
+    Call Gemini with bounded concurrency and backoff on rate limits
+    
+    Uses the async client so the event loop keeps serving other
+    requests during the model call.
+    
+    Args:
+        contents: Prompt contents for generate_content
+        response_schema: Schema the JSON response must follow, or None
+            for a plain text response
+    
+    Returns:
+        Gemini GenerateContentResponse
+    
+    Raises:
+        HTTPException: If no Gemini API key is configured
+        genai_errors.APIError: If the call fails or retries are exhausted
+    """
+    if _GEMINI_CLIENT is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Gemini API key is not configured"
+        )
+    
+    async with _GEMINI_SEMAPHORE:
+        for attempt in range(settings.GEMINI_MAX_RETRIES + 1):
+            try:
+                return await _GEMINI_CLIENT.aio.models.generate_content(
+                    model=settings.GEMINI_MODEL,
+                    contents=contents,
+                    config=genai_types.GenerateContentConfig(
+                        response_mime_type="application/json",
+                        response_schema=response_schema
+                    ) if response_schema is not None else None
+                )
+            except genai_errors.APIError as e:
+                if e.code not in _GEMINI_RETRYABLE_CODES or attempt == settings.GEMINI_MAX_RETRIES:
+                    raise
+                delay = min(2 ** attempt, 10)
+                logger.warning(
+                    f"Gemini returned {e.code}, retrying in {delay}s "
+                    f"(attempt {attempt + 1}/{settings.GEMINI_MAX_RETRIES})"
+                )
+                await asyncio.sleep(delay)
+
+
+class _GeminiBatcher:
+    """
+    Coalesces note generation requests that arrive close together
+    
+    Requests queue for up to max_wait_seconds (or until max_batch are
+    waiting) and are then sent to Gemini as a single prompt that shares
+    one copy of the instructions. A lone request is sent on its own.
+    """
+    
+    def __init__(self, max_batch: int, max_wait_seconds: float):
+        """
+        Initialize the batcher
+        
+        Args:
+            max_batch: Maximum number of videos per Gemini call
+            max_wait_seconds: How long the first queued request waits for company
+        """
+        self._max_batch = max_batch
+        self._max_wait_seconds = max_wait_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Strong references so in-flight dispatches aren't garbage collected
+        self._dispatches: set[asyncio.Task] = set()
+    
+    async def submit(self, video_input: str) -> Dict[str, Any]:
+        """
+        Queue one video for note generation and wait for its result
+        
+        Args:
+            video_input: Per-video INPUT block of the note prompt
+            
+        Returns:
+            Parsed note JSON for this video
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((video_input, future))
+        return await future
+    
+    async def _run(self) -> None:
+        """Collect queued requests into batches and dispatch them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_wait_seconds
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            dispatch = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+    
+    async def _dispatch(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        """
+        Generate notes for one batch and resolve each caller's future
+        
+        If the batched response cannot be matched up with its inputs,
+        every video is retried with its own call.
+        
+        Args:
+            batch: (video_input, future) pairs
+        """
+        try:
+            results = None
+            if len(batch) > 1:
+                try:
+                    results = await self._generate_batch([video_input for video_input, _ in batch])
+                except Exception as e:
+                    logger.warning(f"Batched Gemini call failed, retrying individually: {str(e)}")
+            
+            if results is None:
+                results = await asyncio.gather(
+                    *(self._generate_single(video_input) for video_input, _ in batch),
+                    return_exceptions=True
+                )
+            
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+    
+    async def _generate_single(self, video_input: str) -> Dict[str, Any]:
+        """
+        Generate a note for one video
+        
+        Args:
+            video_input: Per-video INPUT block of the note prompt
+            
+        Returns:
+            Parsed note JSON
+        """
+        response = await _call_gemini(
+            _note_prompt_contents(video_input),
+            response_schema=GeneratedNoteContent
+        )
+        return _parsed_response(response)
+    
+    async def _generate_batch(self, video_inputs: list[str]) -> Optional[list[Dict[str, Any]]]:
+        """
+        Generate notes for several videos with a single Gemini call
+        
+        Args:
+            video_inputs: Per-video INPUT blocks of the note prompt
+            
+        Returns:
+            Parsed note JSON per video in input order, or None if the
+            response does not contain exactly one note per video
+        """
+        response = await _call_gemini(
+            _note_prompt_contents(
+                _NOTE_BATCH_PROMPT_INSTRUCTIONS,
+                *(f"VIDEO {index}\n{video_input}" for index, video_input in enumerate(video_inputs, start=1))
+            ),
+            response_schema=list[GeneratedNoteContent]
+        )
+        notes = _parsed_response(response)
+        if not isinstance(notes, list) or len(notes) != len(video_inputs):
+            logger.warning(f"Batched Gemini call returned {len(notes)} notes for {len(video_inputs)} videos")
+            return None
+        return notes
+
+
+# Shared batcher, only used when GEMINI_BATCH_ENABLED is set
+_GEMINI_BATCHER = _GeminiBatcher(
+    max_batch=settings.GEMINI_BATCH_MAX_SIZE,
+    max_wait_seconds=settings.GEMINI_BATCH_MAX_WAIT_MS / 1000
+)
+
+
 class NoteService:
     """Service class for note-related business logic"""
     
-    def __init__(self, session: Session):
+    def __init__(self, session: AsyncSession, http_session: aiohttp.ClientSession):
         """
         Initialize NoteService
         
         Args:
-            session: Database session
+            session: Async database session
+            http_session: Shared aiohttp session for outbound requests
         """
         self._session = session
+        self._http = http_session
         self._logger = logger
-        
-        self.gemini_client = genai.Client(api_key=settings.GEMINI_API_KEY)
-        self._deepgram_client = DeepgramClient(api_key=settings.DEEPGRAM_API_KEY)
     
     # ============================================================================
     # HELPER METHODS - Note Retrieval
     # ============================================================================
     
-    def _get_note_by_id(self, note_id: int, user_id: int) -> Note:
+    async def _get_note_by_id(self, note_id: int, user_id: int) -> Note:
         """
         Retrieve note by ID for a specific user or raise 404
         
@@ -63,7 +831,7 @@ class NoteService:
         Raises:
             HTTPException: If note not found or user doesn't own it
         """
-        note = self._session.get(Note, note_id)
+        note = await self._session.get(Note, note_id)
         if not note:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -79,11 +847,101 @@ class NoteService:
         
         return note
     
+    async def _raise_note_not_found_or_forbidden(self, note_id: int) -> None:
+        """
+        Raise the right error after a write matched no note for the user
+        
+        Args:
+            note_id: Note ID
+            
+        Raises:
+            HTTPException: 404 if the note doesn't exist, 403 if another user owns it
+        """
+        owner_id = (await self._session.exec(
+            select(Note.user_id).where(Note.id == note_id)
+        )).first()
+        if owner_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Note with ID {note_id} not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to access this note"
+        )
+    
+    async def _get_note_by_youtube_url(self, user_id: int, youtube_url: str) -> Optional[Note]:
+        """
+        Retrieve a user's note for a YouTube URL, if any
+        
+        Args:
+            user_id: User ID
+            youtube_url: YouTube video URL
+            
+        Returns:
+            Note object, or None if the user has no note for this URL
+        """
+        statement = select(Note).where(
+            Note.user_id == user_id,
+            Note.youtube_url == youtube_url
+        )
+        return (await self._session.exec(statement)).first()
+    
+    async def _get_notes_by_video_ids(
+        self,
+        user_id: int,
+        video_ids: Iterable[str]
+    ) -> Dict[str, Note]:
+        """
+        Retrieve a user's notes for several videos in one query
+        
+        Notes match by video ID whatever URL shape they were saved with;
+        the URL substring filter is narrowed by extracting each ID.
+        
+        Args:
+            user_id: User ID
+            video_ids: YouTube video IDs
+            
+        Returns:
+            Notes keyed by video ID, for the videos the user has a note for
+        """
+        video_ids = set(video_ids)
+        if not video_ids:
+            return {}
+        
+        statement = select(Note).where(
+            Note.user_id == user_id,
+            or_(*(Note.youtube_url.contains(video_id, autoescape=True) for video_id in video_ids))
+        ).order_by(Note.id)
+        notes_by_video_id = {}
+        for note in (await self._session.exec(statement)).all():
+            video_id = extract_video_id(note.youtube_url)
+            if video_id in video_ids:
+                notes_by_video_id.setdefault(video_id, note)
+        return notes_by_video_id
+    
+    async def _insert_note(self, note: Note) -> Note:
+        """
+        Persist a new note
+        
+        The session does not expire objects on commit and the primary key
+        comes back from INSERT ... RETURNING, so no refresh is needed.
+        
+        Args:
+            note: Note object to save
+            
+        Returns:
+            Saved note object
+        """
+        self._session.add(note)
+        await self._session.commit()
+        return note
+    
     # ============================================================================
     # HELPER METHODS - Gemini AI Integration
     # ============================================================================
     
-    def _generate_note_with_gemini(
+    async def _generate_note_with_gemini(
         self, 
         subtitle_text: str, 
         video_url: str,
@@ -95,7 +953,8 @@ class NoteService:
         
         Args:
             subtitle_text: Video subtitle text
-            video_url: YouTube video URL
+            video_url: YouTube video URL, canonicalized to a watch URL
+                for the prompt and the cache key
             video_title: Video title
             channel_name: Channel name
             
@@ -106,196 +965,54 @@ class NoteService:
             HTTPException: If Gemini API fails
         """
         try:
-            # Escape variables that might contain special characters
-            # Replace curly braces in subtitle_text to avoid format specifier errors
-            safe_subtitle_text = str(subtitle_text).replace('{', '{{').replace('}', '}}')
-            safe_video_title = str(video_title).replace('{', '{{').replace('}', '}}')
-            safe_channel_name = str(channel_name).replace('{', '{{').replace('}', '}}')
-            safe_video_url = str(video_url).replace('{', '{{').replace('}', '}}')
-            
-            # CRISP-E formatted prompt (Context → Role → Instructions → Style → Parameters → Examples)
-            # NOTE: keep the f-string so variables are injected. Use double braces {{ }} for literal braces in JSON.
-            prompt = f"""
-                C — Context
-                You will receive raw subtitle text and video metadata (title, channel, URL). Analyze the subtitle text deeply and extract structured, accurate, human-readable notes that allow a reader to understand what the video is about, its main ideas, and where important content appears. Use the subtitle text as the primary source. If you cannot detect the language confidently, default to the language of the subtitle text provided.
-
-                INPUT (replace the placeholders before calling the model):
-                - video_title: {safe_video_title}
-                - channel_name: {safe_channel_name}
-                - video_url: {safe_video_url}
-                - subtitle_text: {safe_subtitle_text}
-
-                R — Role
-                Act as an expert note-taking assistant and world-class explainer who: distills long videos into clear notes, identifies key teaching points, extracts important quotes, and produces clean, valid JSON output with zero extra commentary.
-
-                I — Instructions
-                1. Use the EXACT video_title and channel_name provided above — do NOT change them.
-                2. Detect the language of subtitle_text and produce every field text (summary, key_points, descriptions, quotes) in that detected language. Add a "language" field with an ISO 639-1 language code and the language name (e.g., "en - English").
-                3. Return ONLY a single, valid JSON object (no markdown, no code fences, no extra commentary). Ensure the JSON is well-formed and escapes any characters necessary so it parses cleanly.
-                4. Use the following JSON schema exactly (do not add extra top-level fields).
-                5. Timestamps requirements:
-                   - Provide between 3 and 7 timestamp entries (only truly important moments).
-                   - Format: use MM:SS for videos under 1 hour; use HH:MM:SS for videos 1 hour or longer (if video length unknown, default to MM:SS).
-                   - Timestamps must be sorted ascending.
-                   - If an exact timestamp cannot be determined from subtitle_text, provide the nearest approximate timestamp and append " (approx)" to the time value.
-                6. Key points requirements:
-                   - Provide 5–10 items.
-                   - Each key point should be a single sentence or phrase (5–25 words).
-                   - Order by importance (most important first).
-                7. Summary requirements:
-                   - Main "summary" must be 2–3 paragraphs, each paragraph 2–4 sentences.
-                   - Also include a "short_summary" (one sentence, max 30 words).
-                8. Important quotes:
-                   - Provide up to 3 quotes (if present in subtitles), include the exact quote and the timestamp.
-                   - Preserve original punctuation and casing.
-                9. JSON safety and validation:
-                   - Ensure no trailing commas.
-                   - Escape internal quotes and control characters so the JSON parses.
-                   - Do not include any explanatory text outside the JSON object.
-                10. If subtitle_text is empty or contains insufficient content, return a valid JSON object with empty arrays and brief explanatory fields in the same language.
-
-                S — Style
-                - All textual output must be in the detected language of the subtitle_text.
-                - Preserve original wording and casing when extracting quotes.
-                - Write summaries in a clear, professional, and informative tone.
-                - Key points should be concise and actionable.
-                - Timestamp descriptions should be brief (10-30 words) and descriptive.
-                - Notes for reviewers should be helpful and constructive.
-
-                P — Parameters (Hard constraints)
-                - Output MUST be a single valid JSON object. No markdown, no code fences, no trailing commas.
-                - Escape special characters to ensure JSON parses.
-                - Timestamp format: MM:SS for videos < 1 hour; HH:MM:SS for videos ≥ 1 hour. If video length unknown, default to MM:SS.
-                - Language: include a "language" field with ISO 639-1 code and language name (e.g., "en - English").
-                - Keys and structure must follow the exact JSON schema below (do not add top-level fields):
-
-                {{
-                "video_title": "{safe_video_title}",
-                "channel_name": "{safe_channel_name}",
-                "video_url": "{safe_video_url}",
-                "language": "xx - Language Name",
-                "summary": "A comprehensive summary of the video content in 2-3 paragraphs. Cover the main topics, key concepts, and the overall message, using the subtitle_text as the source.",
-                "short_summary": "A one-sentence summary (max 30 words) in the same language.",
-                "key_points": [
-                    "5-10 concise key points (each 5-25 words) that capture the main ideas; return exactly as many items as are needed between 5 and 10."
-                ],
-                "important_quotes": [
-                    {{
-                    "quote": "A short important quotation (up to 2 lines) from the subtitles (preserve original wording).",
-                    "time": "MM:SS or HH:MM:SS if video ≥ 1 hour"
-                    }}
-                ],
-                "timestamps": [
-                    {{
-                    "time": "MM:SS or HH:MM:SS if video ≥ 1 hour",
-                    "description": "Brief description (10-30 words) of what happens at this timestamp — major topic change, key example, or critical fact."
-                    }}
-                ],
-                "notes_for_reviewers": "Optional short suggestions (1-3 bullet-style sentences) about what to check in the transcript or where automatic subtitle errors may affect understanding."
-                }}
-
-                E — Examples
-                Example 1 — Normal case:
-                Input:
-                video_title: "How Neural Networks Learn"
-                channel_name: "AI Explained"
-                video_url: "https://youtube.com/abc123"
-                subtitle_text: "Today we learn how neural networks adjust weights... Backpropagation helps minimize loss..."
-
-                Output:
-                {{
-                "video_title": "How Neural Networks Learn",
-                "channel_name": "AI Explained",
-                "video_url": "https://youtube.com/abc123",
-                "language": "en - English",
-                "summary": "The video explains how neural networks adjust weights using backpropagation. It covers the fundamental concepts of gradient descent and error minimization. The explanation provides clear insights into the learning mechanism of artificial intelligence systems.",
-                "short_summary": "A clear introduction to how neural networks learn using backpropagation.",
-                "key_points": [
-                    "Neural networks improve by adjusting weights to reduce error.",
-                    "Backpropagation calculates gradients to guide learning.",
-                    "Gradient descent minimizes loss functions effectively."
-                ],
-                "important_quotes": [
-                    {{
-                    "quote": "Backpropagation is the learning engine of neural networks.",
-                    "time": "00:45"
-                    }}
-                ],
-                "timestamps": [
-                    {{
-                    "time": "00:10",
-                    "description": "Introduction to neural networks and learning process."
-                    }},
-                    {{
-                    "time": "00:45",
-                    "description": "Explanation of backpropagation mechanism."
-                    }}
-                ],
-                "notes_for_reviewers": "Verify auto-generated timestamps and quote extraction."
-                }}
-
-                Example 2 — Empty subtitle case:
-                Input:
-                video_title: "Sample Video"
-                channel_name: "Sample Channel"
-                video_url: "https://youtube.com/xyz789"
-                subtitle_text: ""
-
-                Output:
-                {{
-                "video_title": "Sample Video",
-                "channel_name": "Sample Channel",
-                "video_url": "https://youtube.com/xyz789",
-                "language": "en - English",
-                "summary": "",
-                "short_summary": "",
-                "key_points": [],
-                "important_quotes": [],
-                "timestamps": [],
-                "notes_for_reviewers": "Insufficient subtitle text to extract notes."
-                }}
-
-                BEGIN analysis of the provided subtitle_text and produce the JSON output now.
-                """
-            
-            # Generate content using Gemini
-            response = self.gemini_client.models.generate_content(
-                model=settings.GEMINI_MODEL,
-                contents=prompt
-            )
+            # Every URL shape of a video hashes and prompts the same, so
+            # youtu.be, m.youtube.com and ?t= links share cached notes
+            video_id = extract_video_id(video_url)
+            if video_id:
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
             
-            # Parse response
-            response_text = response.text.strip()
+            # Output depends only on model, prompt version and the raw
+            # inputs; hashed before digesting, which is not deterministic
+            prompt_hash = hashlib.sha256(
+                f"{settings.GEMINI_MODEL}|{_NOTE_PROMPT_VERSION}|{video_title}|"
+                f"{channel_name}|{video_url}|{subtitle_text}".encode()
+            ).hexdigest()
+            cache_key = f"v{settings.DISK_CACHE_VERSION}:{video_id}:{prompt_hash}"
+            cached_note = await asyncio.to_thread(_NOTE_CONTENT_CACHE.get, cache_key)
+            if cached_note is not None:
+                self._logger.info("Generated note cache hit, skipping Gemini")
+                return cached_note
             
-            # Remove markdown code blocks if present
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            elif response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
+            # Keep long transcripts within the prompt budget: digest them
+            # chunk by chunk, then down-sample whatever is still too long
+            original_length = len(subtitle_text)
+            if original_length > settings.GEMINI_MAX_SUBTITLE_CHARS:
+                subtitle_text = await self._digest_subtitle_text(subtitle_text)
+            subtitle_text = _downsample_subtitle_text(subtitle_text, settings.GEMINI_MAX_SUBTITLE_CHARS)
+            if len(subtitle_text) < original_length:
+                self._logger.info(
+                    f"Subtitle text reduced from {original_length} to {len(subtitle_text)} characters"
+                )
             
-            # Parse JSON
-            try:
-                note_data = json.loads(response_text)
-            except json.JSONDecodeError as e:
-                self._logger.error(f"Failed to parse Gemini response as JSON: {e}")
-                self._logger.error(f"Response text: {response_text[:500]}")
-                # Fallback: create a basic structure with valid required fields
-                # Note: timestamps must have at least one entry to pass validation
-                note_data = {
-                    "video_title": video_title,
-                    "channel_name": channel_name,
-                    "summary": response_text[:1000] if len(response_text) > 1000 else response_text,
-                    "key_points": ["Key point extracted from video"],
-                    "timestamps": [
-                        {
-                            "time": "00:00",
-                            "description": "Video content extracted (parsing failed, using fallback)"
-                        }
-                    ]
-                }
+            # Only the small input block varies per request; the static
+            # instructions are a module-level constant
+            video_input = _NOTE_INPUT_TEMPLATE.substitute(
+                video_title=video_title,
+                channel_name=channel_name,
+                video_url=video_url,
+                subtitle_text=subtitle_text
+            )
+            
+            # Generate content using Gemini in JSON mode; the SDK validates the
+            # response against the schema, so no parsing or repair is needed
+            if settings.GEMINI_BATCH_ENABLED:
+                note_data = await _GEMINI_BATCHER.submit(video_input)
+            else:
+                response = await _call_gemini(
+                    _note_prompt_contents(video_input),
+                    response_schema=GeneratedNoteContent
+                )
+                note_data = _parsed_response(response)
             
             # Validate and structure the response
             key_points_list = note_data.get('key_points', [])
@@ -310,28 +1027,20 @@ class NoteService:
             }
             
             # Validate that all required fields have values
-            missing_fields = []
-            if not result['video_title'] or not str(result['video_title']).strip():
-                missing_fields.append('video_title')
-            if not result['channel_name'] or not str(result['channel_name']).strip():
-                missing_fields.append('channel_name')
-            if not result['summary'] or not str(result['summary']).strip():
-                missing_fields.append('summary')
-            
-            # Check key_points (should be a non-empty list)
-            if not result['key_points'] or not isinstance(result['key_points'], list) or len(result['key_points']) == 0:
-                missing_fields.append('key_points')
-            
-            # Check timestamps (should be a non-empty list)
-            if not result['timestamps'] or not isinstance(result['timestamps'], list) or len(result['timestamps']) == 0:
-                missing_fields.append('timestamps')
-            
+            missing_fields = self._validate_note_payload(result)
             if missing_fields:
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail=f"Failed to generate complete note. Missing required fields: {', '.join(missing_fields)}. Please try again or choose a different video."
                 )
             
+            await asyncio.to_thread(
+                _NOTE_CONTENT_CACHE.set,
+                cache_key,
+                result,
+                expire=settings.NOTE_CONTENT_CACHE_TTL_SECONDS
+            )
+            
             self._logger.info("Successfully generated note with Gemini AI")
             return result
             
@@ -341,7 +1050,69 @@ class NoteService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to generate note with AI: {str(e)}"
             )
-
+    
+    @staticmethod
+    def _validate_note_payload(note_data: Dict[str, Any]) -> list[str]:
+        """
+        Find required note fields that are missing or empty
+        
+        Args:
+            note_data: Generated note data
+            
+        Returns:
+            Names of the missing fields, empty if the note is complete
+        """
+        missing_fields = [
+            field for field in ('video_title', 'channel_name', 'summary')
+            if not note_data.get(field) or str(note_data[field]).isspace()
+        ]
+        # key_points and timestamps must be non-empty lists
+        missing_fields.extend(
+            field for field in ('key_points', 'timestamps')
+            if not note_data.get(field) or not isinstance(note_data[field], list)
+        )
+        return missing_fields
+    
+    async def _digest_subtitle_text(self, subtitle_text: str) -> str:
+        """
+        Condense a long transcript into per-chunk bullet digests
+        
+        The transcript is split into GEMINI_DIGEST_CHUNK_CHARS windows
+        that are digested concurrently (bounded by the Gemini semaphore),
+        and the digests are joined in order for the final note prompt.
+        Very long transcripts get wider windows, so there are never more
+        than GEMINI_DIGEST_MAX_CHUNKS calls. A chunk Gemini returns no
+        text for (e.g. safety-blocked) is passed on as-is.
+        
+        Args:
+            subtitle_text: Full subtitle text
+            
+        Returns:
+            Concatenated chunk digests
+        """
+        max_chunks = settings.GEMINI_DIGEST_MAX_CHUNKS
+        chunk_size = max(
+            settings.GEMINI_DIGEST_CHUNK_CHARS,
+            (len(subtitle_text) + max_chunks - 1) // max_chunks
+        )
+        chunks = [
+            subtitle_text[start:start + chunk_size]
+            for start in range(0, len(subtitle_text), chunk_size)
+        ]
+        responses = await asyncio.gather(*(
+            _call_gemini(f"{_DIGEST_PROMPT_INSTRUCTIONS}\n{chunk}")
+            for chunk in chunks
+        ))
+        digest = "\n\n".join(
+            f"[Part {index}/{len(chunks)}]\n{(response.text or chunk).strip()}"
+            for index, (chunk, response) in enumerate(zip(chunks, responses), start=1)
+        )
+        
+        self._logger.info(
+            f"Digested {len(subtitle_text)} subtitle characters in {len(chunks)} chunks "
+            f"into {len(digest)} characters"
+        )
+        return digest
     
     # ============================================================================
     # HELPER METHODS - Pagination
@@ -393,13 +1164,19 @@ class NoteService:
     # CRUD OPERATIONS - Create
     # ============================================================================
     
-    def create_note(self, user_id: int, note_data: NoteCreate) -> Note:
+    async def create_note(
+        self,
+        user_id: int,
+        note_data: NoteCreate,
+        refresh_metadata: bool = False
+    ) -> Note:
         """
         Create a new note from YouTube video URL
         
         Args:
             user_id: User ID who owns the note
             note_data: Note creation data (YouTube URL)
+            refresh_metadata: Bypass the cached video metadata
             
         Returns:
             Created note object
@@ -407,27 +1184,50 @@ class NoteService:
         Raises:
             HTTPException: If URL is invalid, duplicate, or processing fails
         """
-        # Check if the video is already in the database
-        statement = select(Note).where(
-            Note.user_id == user_id,
-            Note.youtube_url == note_data.youtube_url
-        )
-        existing_note = self._session.exec(statement).first()
+        # Check if the video is already in the database before any YouTube
+        # work; an extraction can't be stopped once it is in a worker
+        existing_note = await self._get_note_by_youtube_url(user_id, note_data.youtube_url)
         if existing_note:
             # Return existing note instead of raising error
             self._logger.info(f"Note already exists for video {note_data.youtube_url}, returning existing note ID: {existing_note.id}")
             return existing_note
-           
+        
+        return await self._create_note_for_video(user_id, note_data, refresh_metadata)
+    
+    async def _create_note_for_video(
+        self,
+        user_id: int,
+        note_data: NoteCreate,
+        refresh_metadata: bool = False
+    ) -> Note:
+        """
+        Generate and save a note for a video the user has no note for yet
+        
+        Args:
+            user_id: User ID who owns the note
+            note_data: Note creation data (YouTube URL)
+            refresh_metadata: Bypass the cached video metadata
+            
+        Returns:
+            Created note object, or the existing one if a concurrent
+            request saved a note for the same URL first
+            
+        Raises:
+            HTTPException: If processing fails
+        """
         try:            
             # Get video metadata
             self._logger.info(f"Fetching metadata for video: {note_data.youtube_url}")
-            video = self.get_video_metadata_from_youtube_video_url(note_data.youtube_url)
+            video = await self.get_video_metadata_from_youtube_video_url(
+                note_data.youtube_url,
+                refresh=refresh_metadata
+            )
             subtitle = video.get('caption', '')
             video_title = video.get('title', '')
             channel_name = video.get('channel_name', '')
             
             # If no subtitle text was extracted, raise error
-            if not subtitle or not subtitle.strip():
+            if not subtitle or subtitle.isspace():
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="No captions/subtitles available for this video. Please choose a video with captions."
@@ -435,48 +1235,22 @@ class NoteService:
             
             # Generate note content with Gemini
             self._logger.info("Generating note content with Gemini AI")
-            generated_data = self._generate_note_with_gemini(
+            generated_data = await self._generate_note_with_gemini(
                 subtitle,
                 note_data.youtube_url,
                 video_title,
                 channel_name
             )
             
-            # Validate all required fields before creating note
-            missing_fields = []
-            if not generated_data.get('video_title') or not str(generated_data['video_title']).strip():
-                missing_fields.append('video_title')
-            if not generated_data.get('channel_name') or not str(generated_data['channel_name']).strip():
-                missing_fields.append('channel_name')
-            if not generated_data.get('summary') or not str(generated_data['summary']).strip():
-                missing_fields.append('summary')
-            
-            # Validate key_points (should be a non-empty list)
-            key_points = generated_data.get('key_points', [])
-            if not key_points or not isinstance(key_points, list) or len(key_points) == 0:
-                missing_fields.append('key_points')
-            
-            # Validate timestamps (should be a non-empty list)
-            timestamps = generated_data.get('timestamps', [])
-            if not timestamps or not isinstance(timestamps, list) or len(timestamps) == 0:
-                missing_fields.append('timestamps')
-            
-            if missing_fields:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Cannot create note: Missing required fields ({', '.join(missing_fields)}). The AI was unable to generate complete note data. Please try again or choose a different video."
-                )
-            
             # Create note instance
-            # Convert Python lists/dicts to JSON strings for database storage
             db_note = Note(
                 user_id=user_id,
                 youtube_url=note_data.youtube_url,
                 video_title=generated_data['video_title'],
                 channel_name=generated_data['channel_name'],
                 summary=generated_data['summary'],
-                key_points=json.dumps(generated_data['key_points']) if generated_data.get('key_points') else None,
-                timestamps=json.dumps(generated_data['timestamps']) if generated_data.get('timestamps') else None,
+                key_points=generated_data.get('key_points') or None,
+                timestamps=generated_data.get('timestamps') or None,
                 duration_in_seconds=video.get('duration_in_seconds'),
                 thumbnail_url=video.get('thumbnail_url'),
                 views=video.get('views'),
@@ -484,10 +1258,18 @@ class NoteService:
                 publish_date=video.get('publish_date')
             )
             
-            # Save to database
-            self._session.add(db_note)
-            self._session.commit()
-            self._session.refresh(db_note)
+            # Save to database. A concurrent request for the same video can
+            # win the race past the duplicate check; the unique index then
+            # rejects this insert and the note it created is returned.
+            try:
+                db_note = await self._insert_note(db_note)
+            except IntegrityError:
+                await self._session.rollback()
+                existing_note = await self._get_note_by_youtube_url(user_id, note_data.youtube_url)
+                if not existing_note:
+                    raise
+                self._logger.info(f"Note for video {note_data.youtube_url} was created concurrently, returning existing note ID: {existing_note.id}")
+                return existing_note
             
             self._logger.info(f"Created note with ID: {db_note.id} for user {user_id}")
             return db_note
@@ -502,11 +1284,129 @@ class NoteService:
                 detail=f"Failed to create note: {error_message}"
             )
     
+    async def create_notes(self, user_id: int, note_data: NoteBatchCreate) -> list[Dict[str, Any]]:
+        """
+        Create notes for several YouTube videos
+        
+        Every URL is validated up front, with the same rules as a single
+        note plus video ID extraction in one pass, so an invalid URL
+        rejects the whole batch before any work starts. Videos are
+        identified by video ID: a URL for a video already in the batch
+        is skipped, and a video the user already has a note for (under
+        any URL shape) returns that note, all found in one query. Notes
+        are created and committed one by one, so a failing video doesn't
+        discard the notes already created; its error is reported in its
+        own result.
+        
+        Args:
+            user_id: User ID who owns the notes
+            note_data: Batch creation data (YouTube URLs)
+            
+        Returns:
+            One result per unique video, in input order, with either the
+            created (or already existing) note or the error message
+            
+        Raises:
+            HTTPException: If any URL is invalid
+        """
+        video_ids = extract_video_ids(note_data.youtube_urls)
+        notes_to_create: Dict[str, NoteCreate] = {}
+        invalid_urls = []
+        for url, video_id in zip(note_data.youtube_urls, video_ids):
+            try:
+                note_create = NoteCreate(youtube_url=url)
+            except ValidationError:
+                video_id = None
+            if video_id is None:
+                invalid_urls.append(url)
+            elif video_id not in notes_to_create:
+                notes_to_create[video_id] = note_create
+        if invalid_urls:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid YouTube URL(s): {', '.join(invalid_urls)}"
+            )
+        
+        # Notes are converted to responses as soon as they are loaded or
+        # created: a rollback after a failed video expires every ORM
+        # object in the session, and an expired one can't be read lazily
+        # on an AsyncSession
+        existing_notes = {
+            video_id: NoteResponse.model_validate(note)
+            for video_id, note in (await self._get_notes_by_video_ids(user_id, notes_to_create)).items()
+        }
+        
+        # Fetch metadata for the new videos concurrently up front; the notes
+        # are then created one by one on this session and hit the warm
+        # cache. Failures are left for _create_note_for_video to report.
+        await self.get_video_metadata_batch([
+            note_create.youtube_url
+            for video_id, note_create in notes_to_create.items()
+            if video_id not in existing_notes
+        ])
+        
+        results = []
+        for video_id, note_create in notes_to_create.items():
+            existing_note = existing_notes.get(video_id)
+            if existing_note:
+                self._logger.info(f"Note already exists for video {video_id}, returning existing note ID: {existing_note.id}")
+                results.append({"youtube_url": note_create.youtube_url, "note": existing_note})
+                continue
+            
+            try:
+                note = await self._create_note_for_video(user_id, note_create)
+            except HTTPException as e:
+                # Leave the session usable for the remaining videos
+                await self._session.rollback()
+                results.append({"youtube_url": note_create.youtube_url, "error": e.detail})
+            else:
+                results.append({"youtube_url": note_create.youtube_url, "note": NoteResponse.model_validate(note)})
+        
+        return results
+    
     # ============================================================================
     # CRUD OPERATIONS - Read
     # ============================================================================
     
-    def get_note_by_id(self, note_id: int, user_id: int) -> Note:
+    async def get_video_preview(self, youtube_url: str) -> Dict[str, Any]:
+        """
+        Get video details for a YouTube URL without fetching captions
+        
+        Already fetched metadata is reused. Otherwise oEmbed answers with
+        title, channel and thumbnail in one request, and pytubefix is only
+        run, for its player response, when oEmbed has no answer.
+        
+        Args:
+            youtube_url: YouTube video URL
+            
+        Returns:
+            Dictionary with the URL and video details
+            
+        Raises:
+            HTTPException: If the URL is invalid or the video cannot be loaded
+        """
+        video_id = extract_video_id(youtube_url)
+        if not video_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid YouTube URL. Must be a valid YouTube link"
+            )
+        
+        video = _VIDEO_METADATA_CACHE.get(video_id)
+        if video is not None:
+            return {"youtube_url": youtube_url, **video}
+        
+        oembed_details = await self._fetch_oembed_details(youtube_url)
+        if oembed_details.get("title"):
+            return {"youtube_url": youtube_url, **oembed_details}
+        
+        video = await self.get_video_metadata_from_youtube_video_url(
+            youtube_url,
+            fetch_subtitle=False
+        )
+        return {"youtube_url": youtube_url, **video}
+    
+    async def get_note_by_id(self, note_id: int, user_id: int) -> Note:
         """
         Get note by ID
         
@@ -520,9 +1420,9 @@ class NoteService:
         Raises:
             HTTPException: If note not found or user doesn't own it
         """
-        return self._get_note_by_id(note_id, user_id)
+        return await self._get_note_by_id(note_id, user_id)
     
-    def get_notes(
+    async def get_notes(
         self,
         user_id: int,
         current_page: int = 1,
@@ -539,15 +1439,16 @@ class NoteService:
             search: Search term (searches title, channel, summary)
             
         Returns:
-            Dictionary with notes list and pagination metadata
+            Dictionary with list item dicts (see NoteListItem) and
+            pagination metadata
         """
-        # Build query - only get notes for this user
-        query = select(Note).where(Note.user_id == user_id)
+        # Build filters - only get notes for this user
+        filters = [Note.user_id == user_id]
         
         # Apply search filter
         if search:
             search_term = f"%{search.strip().lower()}%"
-            query = query.where(
+            filters.append(
                 or_(
                     func.lower(Note.video_title).like(search_term),
                     func.lower(Note.channel_name).like(search_term),
@@ -555,23 +1456,30 @@ class NoteService:
                 )
             )
         
-        # Order by created_at desc
-        query = query.order_by(Note.created_at.desc())
-        
-        # Get all notes matching query
-        all_notes = self._session.exec(query).all()
+        # Count matching notes in the database instead of loading them all;
+        # unfiltered counts are served by the (user_id, created_at) index
+        total_notes = (await self._session.exec(
+            select(func.count()).select_from(Note).where(*filters)
+        )).one()
         
         # Validate and calculate pagination
         current_page, page_size = self._validate_pagination_params(
             current_page, page_size
         )
-        total_notes = len(all_notes)
         total_pages, current_page, start_index, end_index = self._calculate_pagination(
             total_notes, current_page, page_size
         )
         
-        # Get paginated notes
-        paginated_notes = all_notes[start_index:end_index]
+        # Fetch only the requested page, newest first, and only the
+        # columns the list needs
+        rows = (await self._session.exec(
+            select(*_NOTE_LIST_COLUMNS)
+            .where(*filters)
+            .order_by(Note.created_at.desc())
+            .offset(start_index)
+            .limit(page_size)
+        )).all()
+        paginated_notes = [dict(row._mapping) for row in rows]
         
         return {
             "notes": paginated_notes,
@@ -585,7 +1493,7 @@ class NoteService:
     # CRUD OPERATIONS - Update
     # ============================================================================
     
-    def update_note(
+    async def update_note(
         self,
         note_id: int,
         user_id: int,
@@ -605,25 +1513,20 @@ class NoteService:
         Raises:
             HTTPException: If note not found or user doesn't own it
         """
-        # Get the note
-        note = self._get_note_by_id(note_id, user_id)
-        
-        # Update fields
+        # Update the user's note in a single UPDATE ... RETURNING
         update_data = note_data.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            # Convert Python lists/dicts to JSON strings for database storage
-            if key in ('key_points', 'timestamps') and value is not None:
-                setattr(note, key, json.dumps(value))
-            else:
-                setattr(note, key, value)
-        
-        # Update timestamp
-        note.updated_at = datetime.utcnow()
+        result = await self._session.execute(
+            update(Note)
+            .where(Note.id == note_id, Note.user_id == user_id)
+            .values(**update_data, updated_at=datetime.utcnow())
+            .returning(Note)
+        )
+        note = result.scalar_one_or_none()
+        if note is None:
+            await self._session.rollback()
+            await self._raise_note_not_found_or_forbidden(note_id)
         
-        # Save to database
-        self._session.add(note)
-        self._session.commit()
-        self._session.refresh(note)
+        await self._session.commit()
         
         self._logger.info(f"Updated note with ID: {note_id}")
         return note
@@ -632,7 +1535,7 @@ class NoteService:
     # CRUD OPERATIONS - Delete
     # ============================================================================
     
-    def delete_note(self, note_id: int, user_id: int) -> Dict[str, str]:
+    async def delete_note(self, note_id: int, user_id: int) -> Dict[str, str]:
         """
         Delete a note
         
@@ -646,11 +1549,15 @@ class NoteService:
         Raises:
             HTTPException: If note not found or user doesn't own it
         """
-        note = self._get_note_by_id(note_id, user_id)
+        # Delete the user's note in a single DELETE
+        result = await self._session.execute(
+            delete(Note).where(Note.id == note_id, Note.user_id == user_id)
+        )
+        if result.rowcount == 0:
+            await self._session.rollback()
+            await self._raise_note_not_found_or_forbidden(note_id)
         
-        # Delete note
-        self._session.delete(note)
-        self._session.commit()
+        await self._session.commit()
         
         self._logger.info(f"Deleted note with ID: {note_id}")
         return {"message": f"Note with ID {note_id} deleted successfully"}
@@ -660,43 +1567,499 @@ class NoteService:
     # HELPER METHODS - Get Audio from Video
     # ============================================================================
     
-    def get_video_metadata_from_youtube_video_url(self, video_url: str) -> Dict[str, Any]:
+    async def get_video_metadata_from_youtube_video_url(
+        self,
+        video_url: str,
+        refresh: bool = False,
+        fetch_subtitle: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Fetch metadata and subtitle text for a YouTube video
+        
+        Results are cached per video ID in memory for
+        VIDEO_METADATA_CACHE_TTL_SECONDS and on disk, shared by all
+        workers, for VIDEO_METADATA_DISK_CACHE_TTL_SECONDS. Results
+        without caption text are not cached, so a transient failure
+        doesn't stick for the whole TTL.
+        Cache misses share YOUTUBE_MAX_CONCURRENCY slots, so a burst of
+        new videos queues here instead of hammering YouTube.
+        Videos YouTube reported as unavailable are remembered for
+        UNAVAILABLE_VIDEO_CACHE_TTL_SECONDS and rejected without a fetch.
+        
+        Args:
+            video_url: YouTube video URL
+            refresh: Skip the cache and fetch fresh data
+            fetch_subtitle: Also fetch caption text; when False only the
+                video details are loaded and "caption" is empty
+            
+        Returns:
+            Dictionary with video metadata and caption text
+            
+        Raises:
+            HTTPException: If metadata or subtitles cannot be fetched
+        """
+        cache_key = extract_video_id(video_url) or video_url
+        disk_cache_key = f"v{settings.DISK_CACHE_VERSION}:{cache_key}"
+        if not refresh:
+            cached = _VIDEO_METADATA_CACHE.get(cache_key)
+            if cached is not None:
+                self._logger.info(f"Video metadata cache hit for {cache_key}")
+                return cached
+            
+            if cache_key in _UNAVAILABLE_VIDEO_CACHE:
+                self._logger.info(f"Video {cache_key} is known to be unavailable")
+                raise self._video_unavailable_error()
+            
+            cached = await asyncio.to_thread(_VIDEO_METADATA_DISK_CACHE.get, disk_cache_key)
+            if cached is not None:
+                self._logger.info(f"Video metadata disk cache hit for {cache_key}")
+                _VIDEO_METADATA_CACHE[cache_key] = cached
+                return cached
+        
+        async with _YOUTUBE_SEMAPHORE:
+            try:
+                video = await self._fetch_video_metadata(video_url, fetch_subtitle)
+            except _VideoUnavailableError:
+                # Only YouTube's definitive answer is cached; bot checks and
+                # network errors are retried
+                _UNAVAILABLE_VIDEO_CACHE[cache_key] = True
+                raise self._video_unavailable_error()
+        if video.get("caption"):
+            _VIDEO_METADATA_CACHE[cache_key] = video
+            await asyncio.to_thread(
+                _VIDEO_METADATA_DISK_CACHE.set,
+                disk_cache_key,
+                video,
+                expire=settings.VIDEO_METADATA_DISK_CACHE_TTL_SECONDS
+            )
+        return video
+    
+    async def get_video_metadata_batch(
+        self,
+        video_urls: list[str],
+        fetch_subtitle: bool = True
+    ) -> list[Any]:
+        """
+        Fetch metadata for several YouTube videos concurrently
+        
+        Each video goes through get_video_metadata_from_youtube_video_url,
+        so cache hits return immediately and misses share the
+        YOUTUBE_MAX_CONCURRENCY slots.
+        
+        Args:
+            video_urls: YouTube video URLs
+            fetch_subtitle: Also fetch caption text for each video
+            
+        Returns:
+            Per-URL metadata dicts in input order, or the exception
+            raised for that URL
+        """
+        return await asyncio.gather(
+            *(
+                self.get_video_metadata_from_youtube_video_url(url, fetch_subtitle=fetch_subtitle)
+                for url in video_urls
+            ),
+            return_exceptions=True
+        )
+    
+    async def _fetch_video_metadata(
+        self,
+        video_url: str,
+        fetch_subtitle: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Fetch metadata and subtitle text for a YouTube video from YouTube
+        
+        pytubefix loads the player response in the YouTube process pool
+        while English captions are requested from the timedtext endpoint;
+        the caption tracks it lists are only downloaded when that fast
+        path is empty. oEmbed is queried in the background as a
+        title/channel source and only awaited if pytubefix cannot provide
+        those fields, so when pytubefix fails outright but timedtext (or
+        the transcript cache) already has the text, the note can still be
+        made with oEmbed's details at no extra latency. Without
+        fetch_subtitle, only the player response is loaded: no timedtext,
+        caption or audio download happens.
+        
+        Args:
+            video_url: YouTube video URL
+            fetch_subtitle: Fetch caption text as well as video details
+            
+        Returns:
+            Dictionary with video metadata and caption text
+            
+        Raises:
+            HTTPException: If metadata or subtitles cannot be fetched
+        """
+        video_id = extract_video_id(video_url)
+        oembed_task = asyncio.create_task(self._fetch_oembed_details(video_url))
         try:
-            yt = YouTube(video_url, on_progress_callback = on_progress)
-            if len(yt.captions.keys()) > 0:
-                first_lang_code = list(yt.captions.keys())[0].code
-                caption = yt.captions[first_lang_code]
+            if fetch_subtitle:
+                # A cached transcript means the audio never needs downloading
+                cached_transcript = await asyncio.to_thread(self._get_cached_transcript, video_id)
                 
-                response = requests.get(
-                    caption.url, 
-                    timeout=10,
-                    headers={
-                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-                        "Referer": "https://www.youtube.com/"
-                    }
+                video_info, subtitle_content = await asyncio.gather(
+                    self._run_video_extraction(video_url, download_audio=cached_transcript is None),
+                    self._fetch_timedtext_subtitles(video_id),
+                    return_exceptions=True
                 )
-                response.raise_for_status()
-                subtitle_content = self._extract_text_from_xml_transcript(response.text)
+                if isinstance(subtitle_content, BaseException):
+                    raise subtitle_content
+                if isinstance(video_info, HTTPException) and (subtitle_content or cached_transcript):
+                    # pytubefix failed, but there is already text for a note;
+                    # the title and channel then come from oEmbed
+                    self._logger.warning(
+                        f"Video extraction failed for {video_id}, continuing without it: {video_info.detail}"
+                    )
+                    video_info = {"details": {}, "caption_tracks": [], "audio_bytes": None}
+                elif isinstance(video_info, BaseException):
+                    raise video_info
             else:
-                subtitle_content = self._get_subtitle_from_audio(video_url)
+                cached_transcript = None
+                video_info = await self._run_video_extraction(video_url, download_audio=False)
+                subtitle_content = ""
+            details = video_info["details"]
+            caption_tracks = video_info["caption_tracks"]
+            audio_bytes = video_info["audio_bytes"]
+            
+            # The worker downloads audio before timedtext has answered, so
+            # it is only transcribed if timedtext came back empty
+            if audio_bytes and not subtitle_content:
+                subtitle_content = await asyncio.to_thread(self._transcribe_audio, audio_bytes)
+                await asyncio.to_thread(self._cache_transcript, video_id, subtitle_content)
+            elif fetch_subtitle and not subtitle_content:
+                caption_track = self._pick_caption_track(caption_tracks)
+                if caption_track:
+                    subtitle_content = await self._download_caption_text(caption_track["url"])
+                if not subtitle_content and cached_transcript:
+                    self._logger.info(f"Transcript cache hit for {video_id}")
+                    subtitle_content = cached_transcript
+            
+            if not all(details.get(field) for field in _OEMBED_FIELDS):
+                oembed_details = await oembed_task
+                for field in _OEMBED_FIELDS:
+                    if not details.get(field):
+                        details[field] = oembed_details.get(field)
+        finally:
+            # No-op once awaited; otherwise the lookup is no longer needed
+            oembed_task.cancel()
+            
+        return {
+            "caption": subtitle_content,
+            **details
+        }
+    
+    @staticmethod
+    def _video_unavailable_error() -> HTTPException:
+        """Build the error returned for private, deleted or blocked videos"""
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="This video is unavailable. It may be private, deleted or restricted."
+        )
+    
+    async def _run_video_extraction(self, video_url: str, download_audio: bool) -> Dict[str, Any]:
+        """
+        Run pytubefix extraction for a video in the YouTube process pool
+        
+        If the pool turns out to be broken, it is rebuilt and the
+        extraction is tried once more on the new pool.
+        
+        Args:
+            video_url: YouTube video URL
+            download_audio: Download audio if the video has no captions
+            
+        Returns:
+            Extraction result as returned by _extract_video_info
             
+        Raises:
+            _VideoUnavailableError: If YouTube reports the video as unavailable
+            HTTPException: If the video cannot be loaded from YouTube
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            for attempt in range(2):
+                pool = _YOUTUBE_POOL
+                try:
+                    return await loop.run_in_executor(
+                        pool, _extract_video_info, video_url, download_audio
+                    )
+                except BrokenProcessPool:
+                    _rebuild_youtube_pool(pool)
+                    if attempt:
+                        raise
+        except _VideoUnavailableError:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to download audio from YouTube video: {str(e)}"
             )
+    
+    def _pick_caption_track(self, caption_tracks: list[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Pick the caption track to download, preferring English
+        
+        Tracks are ranked in one pass: the preferred codes in order, then
+        any other English variant (manual or auto-generated), then the
+        rest, with ties going to the track listed first.
+        
+        Args:
+            caption_tracks: Caption tracks as returned by _extract_video_info
             
-        return {
-            "title": yt.title,
-            "caption": subtitle_content,
-            "channel_name": yt.author,
-            "duration_in_seconds": yt.length,
-            "thumbnail_url": yt.thumbnail_url,
-            "views": yt.views,
-            "likes": yt.likes,
-            "publish_date": yt.publish_date,
+        Returns:
+            Preferred caption track, or None if there are no tracks
+        """
+        other_english_rank = len(_PREFERRED_CAPTION_CODES)
+        
+        def track_rank(track: Dict[str, Any]) -> int:
+            rank = _CAPTION_CODE_RANK.get(track["code"])
+            if rank is not None:
+                return rank
+            if track["code"].removeprefix("a.").startswith("en"):
+                return other_english_rank
+            return other_english_rank + 1
+        
+        return min(caption_tracks, key=track_rank, default=None)
+    
+    async def _get_with_retries(self, url: str, **kwargs: Any) -> aiohttp.ClientResponse:
+        """
+        Send a GET on the shared session, retrying transient failures
+        
+        Rate limits, 5xx responses and connection errors are retried
+        with exponential backoff. The last response is returned as-is,
+        so callers still decide how to handle a non-200 status.
+        
+        Args:
+            url: Request URL
+            **kwargs: Passed through to aiohttp's get()
+            
+        Returns:
+            aiohttp ClientResponse, to be used as an async context manager
+        """
+        for attempt in range(settings.HTTP_MAX_RETRIES + 1):
+            is_last_attempt = attempt == settings.HTTP_MAX_RETRIES
+            try:
+                response = await self._http.get(url, **kwargs)
+            except aiohttp.ClientConnectionError:
+                if is_last_attempt:
+                    raise
+            else:
+                if response.status not in _HTTP_RETRYABLE_STATUSES or is_last_attempt:
+                    return response
+                response.release()
+            
+            await asyncio.sleep(settings.HTTP_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+    
+    async def _fetch_oembed_details(self, video_url: str) -> Dict[str, Any]:
+        """
+        Fetch basic video details from the YouTube oEmbed endpoint
+        
+        Cheap, player-independent source for title, channel and
+        thumbnail. Successful lookups are cached per video ID for as
+        long as the response's Cache-Control allows, capped at
+        OEMBED_CACHE_TTL_SECONDS in memory and at
+        OEMBED_DISK_CACHE_TTL_SECONDS on disk; any failure yields an
+        empty dict and is not cached.
+        
+        Args:
+            video_url: YouTube video URL
             
+        Returns:
+            Dictionary with title, channel_name and thumbnail_url, or empty dict
+        """
+        cache_key = extract_video_id(video_url) or video_url
+        cached = _OEMBED_CACHE.get(cache_key)
+        if cached is not None:
+            expires_at, oembed_details = cached
+            if expires_at > time.time():
+                return oembed_details
+            del _OEMBED_CACHE[cache_key]
+        
+        disk_cache_key = f"v{settings.DISK_CACHE_VERSION}:{cache_key}"
+        cached, expires_at = await asyncio.to_thread(
+            _OEMBED_DISK_CACHE.get, disk_cache_key, expire_time=True
+        )
+        if cached is not None:
+            _OEMBED_CACHE[cache_key] = (
+                expires_at or time.time() + settings.OEMBED_CACHE_TTL_SECONDS,
+                cached
+            )
+            return cached
+        
+        try:
+            oembed_response = await asyncio.wait_for(
+                self._request_oembed(video_url),
+                timeout=_OEMBED_BUDGET_SECONDS
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            self._logger.info(f"oEmbed lookup failed for {video_url}: {str(e)}")
+            return {}
+        
+        if oembed_response is None:
+            return {}
+        data, cache_ttl = oembed_response
+        
+        oembed_details = {
+            "title": data.get("title"),
+            "channel_name": data.get("author_name"),
+            "thumbnail_url": data.get("thumbnail_url"),
         }
+        if cache_ttl:
+            _OEMBED_CACHE[cache_key] = (time.time() + cache_ttl, oembed_details)
+            await asyncio.to_thread(
+                _OEMBED_DISK_CACHE.set,
+                disk_cache_key,
+                oembed_details,
+                expire=cache_ttl
+            )
+        return oembed_details
+    
+    async def _request_oembed(self, video_url: str) -> Optional[tuple[Dict[str, Any], int]]:
+        """
+        Request oEmbed data for a video
+        
+        Args:
+            video_url: YouTube video URL
+            
+        Returns:
+            Parsed oEmbed data and how long it may be cached, or None if
+            the endpoint did not answer with 200
+        """
+        async with await self._get_with_retries(
+            _OEMBED_URL,
+            params={"url": video_url, "format": "json"},
+            timeout=_OEMBED_TIMEOUT
+        ) as response:
+            if response.status != 200:
+                return None
+            # oEmbed is always UTF-8 JSON; read raw bytes to skip
+            # charset sniffing and the stdlib decoder
+            data = orjson.loads(await response.read())
+            cache_ttl = _cache_control_ttl(
+                response.headers.get("Cache-Control"),
+                settings.OEMBED_DISK_CACHE_TTL_SECONDS
+            )
+        return data, cache_ttl
+    
+    async def _fetch_timedtext_subtitles(self, video_id: Optional[str]) -> str:
+        """
+        Fetch English captions straight from the timedtext endpoint
+        
+        Fast path that needs no caption track discovery. Any failure or
+        empty body yields an empty string so the caller can fall back.
+        
+        Args:
+            video_id: YouTube video ID
+            
+        Returns:
+            Extracted subtitle text, or empty string if unavailable
+        """
+        if not video_id:
+            return ""
+        
+        try:
+            async with await self._get_with_retries(
+                _TIMEDTEXT_URL,
+                params={"v": video_id, "lang": "en", "fmt": "json3"},
+                timeout=_TIMEDTEXT_TIMEOUT
+            ) as response:
+                if response.status != 200:
+                    return ""
+                return await self._read_json3_transcript_text(response)
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError, ijson.JSONError) as e:
+            # An empty body (no track for this language) surfaces as an
+            # incomplete JSON error
+            self._logger.info(f"Timedtext fast path unavailable for {video_id}: {str(e)}")
+            return ""
+    
+    async def _download_caption_text(self, caption_url: str) -> str:
+        """
+        Download a caption track and extract its text
+        
+        The track is requested as JSON3 and stream-parsed while it
+        downloads. XML is used if the server ignores the format, and the
+        track is fetched again in its default XML format if the JSON3
+        body turns out to be malformed.
+        
+        Args:
+            caption_url: Caption track URL
+            
+        Returns:
+            Extracted subtitle text, or empty string if the download fails
+        """
+        try:
+            async with await self._get_with_retries(
+                _json3_caption_url(caption_url),
+                timeout=_CAPTION_TIMEOUT
+            ) as response:
+                response.raise_for_status()
+                if 'xml' in response.content_type:
+                    return await self._read_xml_transcript_text(response)
+                return await self._read_json3_transcript_text(response)
+            
+        except ijson.JSONError as e:
+            self._logger.info(f"JSON3 caption track unreadable, refetching as XML: {str(e)}")
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+            self._logger.warning(f"Caption track download failed: {str(e)}")
+            return ""
+        
+        try:
+            async with await self._get_with_retries(
+                caption_url,
+                timeout=_CAPTION_TIMEOUT
+            ) as response:
+                response.raise_for_status()
+                return await self._read_xml_transcript_text(response)
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeDecodeError) as e:
+            self._logger.warning(f"XML caption track download failed: {str(e)}")
+            return ""
+    
+    async def _read_xml_transcript_text(self, response: aiohttp.ClientResponse) -> str:
+        """
+        Read an XML transcript response and extract its text
+        
+        ElementTree parses the whole document in one CPU-bound call, so it
+        runs in a worker thread rather than stalling the event loop.
+        
+        Args:
+            response: Open aiohttp response with an XML transcript body
+            
+        Returns:
+            Extracted text content as a single string
+        """
+        # Caption tracks are UTF-8, so decode directly instead of sniffing
+        xml_content = (await response.read()).decode('utf-8')
+        return await asyncio.to_thread(self._extract_text_from_xml_transcript, xml_content)
+    
+    async def _read_json3_transcript_text(self, response: aiohttp.ClientResponse) -> str:
+        """
+        Stream-parse a JSON3 transcript response and extract its text
+        
+        Only the utf8 text leaves are pulled out as the body streams in;
+        event and segment objects are never built, and the text is
+        written straight into one buffer rather than kept as a list of
+        small strings, so peak memory stays close to the output size.
+        
+        Args:
+            response: Open aiohttp response with a JSON3 transcript body
+                ({"events": [{"segs": [{"utf8": ...}]}]})
+            
+        Returns:
+            Extracted text content as a single string
+            
+        Raises:
+            ijson.JSONError: If the body is empty or not valid JSON
+        """
+        buffer = io.StringIO()
+        async for text in ijson.items(response.content, 'events.item.segs.item.utf8'):
+            if text and not text.isspace():
+                if buffer.tell():
+                    buffer.write(" ")
+                buffer.write(_collapse_whitespace(text))
+        
+        return buffer.getvalue()
         
         
     def _extract_text_from_xml_transcript(self, xml_content: str) -> str:
@@ -716,30 +2079,20 @@ class NoteService:
             # Parse XML
             root = ET.fromstring(xml_content)
             
-            # Extract all text from <text> tags
-            text_parts = []
-            for text_elem in root.findall('.//text'):
-                text_content = text_elem.text
-                if text_content:
-                    text_parts.append(text_content.strip())
-            
-            # Join all text parts with spaces
-            extracted_text = " ".join(text_parts)
-            
-            # Clean up extra whitespace
-            extracted_text = re.sub(r'\s+', ' ', extracted_text).strip()
-            
-            return extracted_text
+            # Extract all text from <text> tags, normalizing each segment
+            # so the joined result needs no second whitespace pass
+            return _join_caption_segments(
+                text_elem.text for text_elem in root.iter('text')
+            )
             
         except ET.ParseError as e:
             self._logger.warning(f"Failed to parse XML transcript, trying regex extraction: {str(e)}")
             # Fallback: Use regex to extract text if XML parsing fails
-            text_pattern = r'<text[^>]*>([^<]+)</text>'
-            matches = re.findall(text_pattern, xml_content)
-            if matches:
-                extracted_text = " ".join(match.strip() for match in matches)
-                extracted_text = re.sub(r'\s+', ' ', extracted_text).strip()
-                return extracted_text
+            text = _join_caption_segments(
+                match.group(1) for match in _XML_TEXT_RE.finditer(xml_content)
+            )
+            if text:
+                return text
             else:
                 # If regex also fails, return original content
                 self._logger.error("Failed to extract text from transcript using both XML parsing and regex")
@@ -749,63 +2102,56 @@ class NoteService:
             return xml_content
     
     
-    def _get_subtitle_from_audio(self, video_url: str) -> str:
+    def _get_cached_transcript(self, video_id: Optional[str]) -> Optional[str]:
         """
-        Get subtitle from audio of a YouTube video
+        Look up a cached audio transcript
         
         Args:
-            video_url: YouTube video URL
+            video_id: YouTube video ID
+            
+        Returns:
+            Cached transcript text, or None on a miss
+        """
+        if not video_id:
+            return None
+        return _TRANSCRIPT_CACHE.get(f"v{settings.DISK_CACHE_VERSION}:{video_id}")
+    
+    def _cache_transcript(self, video_id: Optional[str], transcript: str) -> None:
+        """
+        Store an audio transcript for TRANSCRIPT_CACHE_TTL_SECONDS
+        
+        Args:
+            video_id: YouTube video ID
+            transcript: Transcript text
+        """
+        if not video_id or not transcript:
+            return
+        _TRANSCRIPT_CACHE.set(
+            f"v{settings.DISK_CACHE_VERSION}:{video_id}",
+            transcript,
+            expire=settings.TRANSCRIPT_CACHE_TTL_SECONDS
+        )
+    
+    def _transcribe_audio(self, audio_bytes: bytes) -> str:
+        """
+        Transcribe downloaded audio with Deepgram
+        
+        Args:
+            audio_bytes: Raw audio file bytes to transcribe
             
         Returns:
             Subtitle text
         """
         try:
-            yt = YouTube(video_url, on_progress_callback=on_progress)
-
-            # Get the backend directory path (parent of modules directory)
-            backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            temp_audio_dir = os.path.join(backend_dir, 'temp_audio_files')
-            audio_file_name = video_url.split("=")[-1] + ".wav"
-            
-            audio_file_path = os.path.join(temp_audio_dir, audio_file_name)
-            
-            # Create directory if it doesn't exist
-            os.makedirs(temp_audio_dir, exist_ok=True)
-            
-            ys = yt.streams.get_audio_only()
-            ys.download(output_path=temp_audio_dir)
-
-            audio = AudioSegment.from_file(os.path.join(temp_audio_dir, ys.default_filename), format="m4a")
-            audio.export(audio_file_path, format="wav")
-            
-            # delete the original m4a file
-            os.remove(os.path.join(temp_audio_dir, ys.default_filename))
-            
-            # convert audio to text
-            try:
-                with open(audio_file_path, "rb") as audio_file:
-                    response = self._deepgram_client.listen.v1.media.transcribe_file(
-                        request=audio_file.read(),
-                        model=settings.DEEPGRAM_MODEL,
-                        smart_format=True,
-                    )
-                
-                transcript = response.results.channels[0].alternatives[0].transcript
-                os.remove(audio_file_path)
-                return transcript
-
-            except Exception as e:
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f"Failed to convert audio to text: {str(e)}"
-                )
-  
+            response = _get_deepgram_client().listen.v1.media.transcribe_file(
+                request=audio_bytes,
+                model=settings.DEEPGRAM_MODEL,
+                smart_format=True,
+            )
+            return response.results.channels[0].alternatives[0].transcript
+        
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Failed to get subtitle from audio of YouTube video: {str(e)}"
+                detail=f"Failed to convert audio to text: {str(e)}"
             )
-
-        
-        
-
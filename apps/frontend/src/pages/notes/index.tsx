@@ -29,7 +29,7 @@ import {
   Play,
   ThumbsUp,
 } from "lucide-react";
-import type { Note } from "@/types/notes.types";
+import type { NoteListItem } from "@/types/notes.types";
 
 /**
  * Notes list page component
@@ -184,7 +184,7 @@ export function NotesListPage() {
       {!isLoading && !error && data && data.notes.length > 0 && (
         <>
           <div className="grid gap-4 md:grid-cols-2 lg:grid-cols-3 mb-6">
-            {data.notes.map((note: Note) => (
+            {data.notes.map((note: NoteListItem) => (
               <Card
                 key={note.id}
                 className="cursor-pointer hover:shadow-lg transition-shadow focus-within:ring-2 focus-within:ring-ring overflow-hidden"
@@ -262,11 +262,11 @@ export function NotesListPage() {
                   <p className="text-sm text-muted-foreground line-clamp-3">
                     {truncateText(note.summary)}
                   </p>
-                  {note.key_points && note.key_points.length > 0 && (
+                  {note.key_points_count > 0 && (
                     <div className="mt-3">
                       <p className="text-xs text-muted-foreground">
-                        {note.key_points.length} key point
-                        {note.key_points.length !== 1 ? "s" : ""}
+                        {note.key_points_count} key point
+                        {note.key_points_count !== 1 ? "s" : ""}
                       </p>
                     </div>
                   )}
@@ -22,6 +22,20 @@ export interface Note {
   updated_at: string;
 }
 
+export interface NoteListItem {
+  id: number;
+  youtube_url: string;
+  video_title: string | null;
+  channel_name: string | null;
+  summary: string | null;
+  key_points_count: number;
+  duration_in_seconds: number | null;
+  thumbnail_url: string | null;
+  views: number | null;
+  likes: number | null;
+  created_at: string;
+}
+
 export interface Timestamp {
   time: string;
   description: string;
@@ -45,7 +59,7 @@ export interface NoteUpdate {
 }
 
 export interface NotePagination {
-  notes: Note[];
+  notes: NoteListItem[];
   total_notes: number;
   total_pages: number;
   current_page: number;